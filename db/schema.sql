@@ -0,0 +1,29 @@
+CREATE TABLE IF NOT EXISTS invoices (
+    id INTEGER PRIMARY KEY,
+    source_path TEXT NOT NULL UNIQUE,
+    document_id TEXT,
+    issue_date TEXT,
+    currency TEXT,
+    seller_name TEXT,
+    buyer_name TEXT,
+    gross_total REAL,
+    is_valid INTEGER NOT NULL DEFAULT 0,
+    validation_errors TEXT,
+    extracted_json TEXT,
+    raw_text TEXT,
+    created_at TEXT NOT NULL DEFAULT (datetime('now'))
+);
+
+CREATE INDEX IF NOT EXISTS ix_invoices_document_id ON invoices (document_id);
+
+CREATE TABLE IF NOT EXISTS batch_checkpoints (
+    source_path TEXT PRIMARY KEY,
+    file_size INTEGER NOT NULL,
+    file_mtime REAL NOT NULL,
+    status TEXT NOT NULL,
+    error TEXT,
+    duration_ms INTEGER,
+    processed_at TEXT NOT NULL DEFAULT (datetime('now'))
+);
+
+CREATE INDEX IF NOT EXISTS ix_batch_checkpoints_status ON batch_checkpoints (status);
@@ -0,0 +1,38 @@
+"""import pages
+
+Revision ID: 0002_import_pages
+Revises: 0001_init
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002_import_pages"
+down_revision = "0001_init"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "import_pages",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("import_id", sa.Integer(), nullable=False),
+        sa.Column("page_number", sa.Integer(), nullable=False),
+        sa.Column("label", sa.Text(), nullable=False),
+        sa.Column("score", sa.Float(), nullable=False),
+        sa.Column("reason", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["import_id"], ["import_records.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_import_pages_id"), "import_pages", ["id"], unique=False)
+    op.create_index(op.f("ix_import_pages_import_id"), "import_pages", ["import_id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_import_pages_import_id"), table_name="import_pages")
+    op.drop_index(op.f("ix_import_pages_id"), table_name="import_pages")
+    op.drop_table("import_pages")
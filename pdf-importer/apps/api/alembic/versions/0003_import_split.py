@@ -0,0 +1,33 @@
+"""import split
+
+Revision ID: 0003_import_split
+Revises: 0002_import_pages
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003_import_split"
+down_revision = "0002_import_pages"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("import_records") as batch:
+        batch.add_column(sa.Column("parent_id", sa.Integer(), nullable=True))
+        batch.add_column(sa.Column("page_start", sa.Integer(), nullable=True))
+        batch.add_column(sa.Column("page_end", sa.Integer(), nullable=True))
+        batch.create_foreign_key("fk_import_records_parent_id", "import_records", ["parent_id"], ["id"])
+        batch.create_index(batch.f("ix_import_records_parent_id"), ["parent_id"], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("import_records") as batch:
+        batch.drop_index(batch.f("ix_import_records_parent_id"))
+        batch.drop_constraint("fk_import_records_parent_id", type_="foreignkey")
+        batch.drop_column("page_end")
+        batch.drop_column("page_start")
+        batch.drop_column("parent_id")
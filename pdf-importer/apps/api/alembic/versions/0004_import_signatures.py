@@ -0,0 +1,42 @@
+"""import signatures
+
+Revision ID: 0004_import_signatures
+Revises: 0003_import_split
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004_import_signatures"
+down_revision = "0003_import_split"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("import_records") as batch:
+        batch.add_column(sa.Column("duplicate_of_id", sa.Integer(), nullable=True))
+
+    op.create_table(
+        "import_signatures",
+        sa.Column("import_id", sa.Integer(), nullable=False),
+        sa.Column("simhash", sa.BigInteger(), nullable=False),
+        sa.Column("band0", sa.Integer(), nullable=False),
+        sa.Column("band1", sa.Integer(), nullable=False),
+        sa.Column("band2", sa.Integer(), nullable=False),
+        sa.Column("band3", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["import_id"], ["import_records.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("import_id"),
+    )
+    for band in range(4):
+        op.create_index(op.f(f"ix_import_signatures_band{band}"), "import_signatures", [f"band{band}"], unique=False)
+
+
+def downgrade() -> None:
+    for band in range(4):
+        op.drop_index(op.f(f"ix_import_signatures_band{band}"), table_name="import_signatures")
+    op.drop_table("import_signatures")
+    with op.batch_alter_table("import_records") as batch:
+        batch.drop_column("duplicate_of_id")
@@ -0,0 +1,37 @@
+"""import page text
+
+Revision ID: 0005_import_page_text
+Revises: 0004_import_signatures
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005_import_page_text"
+down_revision = "0004_import_signatures"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("import_pages") as batch:
+        batch.add_column(sa.Column("status", sa.Text(), server_default="pending", nullable=False))
+        batch.add_column(sa.Column("engine", sa.Text(), nullable=True))
+        batch.add_column(sa.Column("text", sa.Text(), nullable=True))
+        batch.add_column(sa.Column("words", sa.Text(), nullable=True))
+        batch.add_column(sa.Column("duration_ms", sa.Integer(), nullable=True))
+        batch.add_column(sa.Column("error", sa.Text(), nullable=True))
+    # pages the classifier dropped before this revision were never extracted either
+    op.execute("UPDATE import_pages SET status = 'skipped' WHERE label <> 'invoice'")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("import_pages") as batch:
+        batch.drop_column("error")
+        batch.drop_column("duration_ms")
+        batch.drop_column("words")
+        batch.drop_column("text")
+        batch.drop_column("engine")
+        batch.drop_column("status")
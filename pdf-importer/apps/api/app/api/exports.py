@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.models import ModelDefinition
+from app.services.export import ExportFilter, export_csv, export_ndjson, export_parquet, iter_records, schema_columns
+
+router = APIRouter(prefix="/api/exports", tags=["exports"])
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _stream(filters: ExportFilter, fmt: str, columns):
+    # the response outlives the request dependencies, so the cursor gets its own session
+    db = SessionLocal()
+    try:
+        records = iter_records(db, filters)
+        if fmt == "ndjson":
+            yield from export_ndjson(records)
+        elif fmt == "csv":
+            yield from export_csv(records, columns)
+        else:
+            yield from export_parquet(records, columns)
+    finally:
+        db.close()
+
+
+@router.get("/imports")
+def export_imports(
+    format: Literal["ndjson", "csv", "parquet"] = Query(default="ndjson"),
+    model_id: int | None = Query(default=None),
+    status: str | None = Query(default=None),
+    created_from: datetime | None = Query(default=None),
+    created_to: datetime | None = Query(default=None),
+    db: Session = Depends(get_db),
+):
+    columns = None
+    if format != "ndjson":
+        if model_id is None:
+            raise HTTPException(status_code=400, detail="model_id is required for csv and parquet exports")
+        model = db.query(ModelDefinition).filter(ModelDefinition.id == model_id).first()
+        if not model:
+            raise HTTPException(status_code=404, detail="model not found")
+        columns = schema_columns(json.loads(model.json_schema))
+        if format == "parquet":
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise HTTPException(status_code=501, detail="parquet export requires pyarrow") from None
+
+    filters = ExportFilter(model_id=model_id, status=status, created_from=created_from, created_to=created_to)
+    return StreamingResponse(
+        _stream(filters, format, columns),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="imports.{format}"'},
+    )
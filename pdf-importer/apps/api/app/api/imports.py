@@ -1,21 +1,28 @@
 from __future__ import annotations
 
 import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
 
-import fitz
-from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile
-from fastapi.responses import FileResponse, Response
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Request, UploadFile
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.db.session import SessionLocal
 from app.models import ImportRecord, ModelDefinition
-from app.schemas import ImportOut, Message
-from app.services.pipeline import process_import
-from app.services.storage import import_pdf_path, import_preview_path
+from app.schemas import ImportOut, ImportPageOut, Message, SimilarImportOut
+from app.services.dedup import register_signature, similar_imports
+from app.services.governor import AdmissionRejected, governor
+from app.services.pipeline import PAGE_FAILED, PAGE_PENDING, process_import
+from app.services.splitter import detect_documents
+from app.services.storage import StorageBackend, get_storage, import_pdf_key, import_preview_key
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/imports", tags=["imports"])
 
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
 
 def get_db():
     db = SessionLocal()
@@ -25,19 +32,160 @@ def get_db():
         db.close()
 
 
-def generate_preview_image(pdf_path, preview_path, page: int = 1, zoom: float = 1.4, cache: bool = True) -> bytes:
+def generate_preview_image(pdf_path, import_id: int, page: int = 1, zoom: float = 1.4, cache: bool = True) -> bytes:
+    import fitz
+
     with fitz.open(pdf_path) as doc:
         if page > doc.page_count:
             raise HTTPException(status_code=404, detail="page not found")
         pix = doc.load_page(page - 1).get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
         png = pix.tobytes("png")
         if cache:
-            preview_path.write_bytes(png)
+            get_storage().save(import_preview_key(import_id), png)
         return png
 
 
+def count_pdf_pages(pdf_path) -> int:
+    import fitz
+
+    with fitz.open(pdf_path) as doc:
+        return doc.page_count
+
+
+def parse_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """Return the inclusive byte range requested by a single-range ``Range`` header.
+
+    Multi-range and malformed headers are ignored (the full body is served);
+    unsatisfiable ranges raise 416.
+    """
+    if not header:
+        return None
+    match = _RANGE_RE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        start = max(size - int(last), 0)
+        end = size - 1
+    if start >= size or start > end:
+        raise HTTPException(
+            status_code=416,
+            detail="requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, end
+
+
+def stream_object(
+    storage: StorageBackend, key: str, media_type: str, range_header: str | None = None, headers: dict | None = None
+) -> StreamingResponse:
+    size = storage.size(key)
+    headers = {"Accept-Ranges": "bytes", **(headers or {})}
+    byte_range = parse_range(range_header, size)
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(storage.iter_bytes(key), media_type=media_type, headers=headers)
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        storage.iter_bytes(key, start=start, end=end), status_code=206, media_type=media_type, headers=headers
+    )
+
+
+def source_pdf_key(row: ImportRecord) -> str:
+    """Split children read their pages straight from the parent's file."""
+    return import_pdf_key(row.parent_id or row.id)
+
+
+def source_page(row: ImportRecord, page: int) -> int:
+    if row.page_start is None:
+        return page
+    if row.page_start + page - 1 > row.page_end:
+        raise HTTPException(status_code=404, detail="page not found")
+    return row.page_start + page - 1
+
+
+def run_import(rec: ImportRecord, model: ModelDefinition, target, db: Session) -> None:
+    try:
+        text, extracted_json = process_import(rec, model, target, db)
+    except Exception as exc:
+        logger.exception("failed import id=%s", rec.id)
+        rec.status = "failed"
+        rec.error = str(exc)
+    else:
+        rec.ocr_text = text
+        rec.extracted_json = extracted_json
+        rec.status = "done"
+        rec.error = None
+        if register_signature(db, rec):
+            logger.info("import id=%s looks like a duplicate of id=%s", rec.id, rec.duplicate_of_id)
+
+
+def _process_child(child_id: int, target) -> None:
+    db = SessionLocal()
+    try:
+        child = db.query(ImportRecord).filter(ImportRecord.id == child_id).first()
+        try:
+            generate_preview_image(target, child.id, page=child.page_start, zoom=1.4)
+        except Exception:
+            logger.exception("failed preview generation id=%s", child.id)
+        run_import(child, child.model, target, db)
+        db.add(child)
+        db.commit()
+    finally:
+        db.close()
+
+
+def split_import(rec: ImportRecord, target, db: Session) -> bool:
+    ranges = detect_documents(target)
+    if len(ranges) < 2:
+        return False
+
+    logger.info("splitting import id=%s into %s documents", rec.id, len(ranges))
+    rec.children = [
+        ImportRecord(
+            model_id=rec.model_id,
+            filename=f"{rec.filename} (pages {start}-{end})",
+            status="processing",
+            page_start=start,
+            page_end=end,
+        )
+        for start, end in ranges
+    ]
+    rec.status = "split"
+    db.add(rec)
+    db.commit()
+
+    child_ids = [child.id for child in rec.children]
+    with ThreadPoolExecutor(max_workers=settings.batch_split_workers) as pool:
+        list(pool.map(lambda child_id: _process_child(child_id, target), child_ids))
+    db.expire(rec)
+    return True
+
+
+def process_upload(rec: ImportRecord, model: ModelDefinition, target, db: Session) -> None:
+    try:
+        generate_preview_image(target, rec.id, page=1, zoom=1.4)
+    except Exception:
+        logger.exception("failed preview generation id=%s", rec.id)
+
+    split = False
+    if settings.batch_split_enabled:
+        try:
+            split = split_import(rec, target, db)
+        except Exception:
+            logger.exception("failed batch split id=%s", rec.id)
+    if not split:
+        run_import(rec, model, target, db)
+
+
 @router.post("", response_model=ImportOut)
-async def create_import(
+def create_import(
     model_id: int = Form(...),
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
@@ -54,25 +202,25 @@ async def create_import(
     db.commit()
     db.refresh(rec)
 
-    target = import_pdf_path(rec.id)
-    content = await file.read()
-    target.write_bytes(content)
-    preview_path = import_preview_path(rec.id)
-    try:
-        generate_preview_image(target, preview_path, page=1, zoom=1.4)
-    except Exception:
-        logger.exception("failed preview generation id=%s", rec.id)
-
-    try:
-        text, extracted_json = process_import(rec, model, target)
-        rec.ocr_text = text
-        rec.extracted_json = extracted_json
-        rec.status = "done"
-        rec.error = None
-    except Exception as exc:
-        logger.exception("failed import id=%s", rec.id)
-        rec.status = "failed"
-        rec.error = str(exc)
+    storage = get_storage()
+    key = import_pdf_key(rec.id)
+    storage.save_fileobj(key, file.file)
+    with storage.local_path(key) as target:
+        try:
+            pages = count_pdf_pages(target)
+        except Exception as exc:
+            # nothing is rendered for a file PyMuPDF cannot open, so it needs no admission
+            rec.status = "failed"
+            rec.error = f"unreadable pdf: {exc}"
+        else:
+            try:
+                with governor.acquire(pages=pages, dpi=settings.ocr_dpi):
+                    process_upload(rec, model, target, db)
+            except AdmissionRejected:
+                storage.delete(key)
+                db.delete(rec)
+                db.commit()
+                raise
 
     db.add(rec)
     db.commit()
@@ -81,8 +229,11 @@ async def create_import(
 
 
 @router.get("", response_model=list[ImportOut])
-def list_imports(db: Session = Depends(get_db)):
-    rows = db.query(ImportRecord).order_by(ImportRecord.created_at.desc()).all()
+def list_imports(parent_id: int | None = Query(default=None), db: Session = Depends(get_db)):
+    query = db.query(ImportRecord)
+    if parent_id is not None:
+        query = query.filter(ImportRecord.parent_id == parent_id)
+    rows = query.order_by(ImportRecord.created_at.desc()).all()
     return [ImportOut.from_row(r) for r in rows]
 
 
@@ -94,18 +245,84 @@ def get_import(import_id: int, db: Session = Depends(get_db)):
     return ImportOut.from_row(row)
 
 
+@router.get("/{import_id}/pages", response_model=list[ImportPageOut])
+def get_import_pages(
+    import_id: int, include_words: bool = Query(default=False), db: Session = Depends(get_db)
+):
+    row = db.query(ImportRecord).filter(ImportRecord.id == import_id).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="import not found")
+    return [ImportPageOut.from_row(p, include_words=include_words) for p in row.pages]
+
+
+@router.post("/{import_id}/reprocess", response_model=ImportOut)
+def reprocess_import(import_id: int, reset: bool = Query(default=False), db: Session = Depends(get_db)):
+    """Run the pipeline again; pages extracted by an earlier attempt are reused unless ``reset`` is set."""
+    row = db.query(ImportRecord).filter(ImportRecord.id == import_id).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="import not found")
+    if row.children:
+        raise HTTPException(status_code=409, detail="split imports are reprocessed per document")
+
+    storage = get_storage()
+    key = source_pdf_key(row)
+    if not storage.exists(key):
+        raise HTTPException(status_code=404, detail="file not found")
+
+    with storage.local_path(key) as target:
+        try:
+            total_pages = count_pdf_pages(target)
+        except Exception as exc:
+            row.status = "failed"
+            row.error = f"unreadable pdf: {exc}"
+        else:
+            if row.pages and not reset:
+                pages = sum(p.status in (PAGE_PENDING, PAGE_FAILED) for p in row.pages)
+            elif row.page_start is not None:
+                pages = row.page_end - row.page_start + 1
+            else:
+                pages = total_pages
+            # the row is only touched once admitted, so a 429 leaves it as it was
+            with governor.acquire(pages=pages, dpi=settings.ocr_dpi):
+                if reset:
+                    row.pages = []
+                row.status = "processing"
+                row.error = None
+                db.commit()
+                run_import(row, row.model, target, db)
+
+    db.add(row)
+    db.commit()
+    db.refresh(row)
+    return ImportOut.from_row(row)
+
+
+@router.get("/{import_id}/similar", response_model=list[SimilarImportOut])
+def get_similar_imports(import_id: int, limit: int = Query(default=5, ge=1, le=50), db: Session = Depends(get_db)):
+    row = db.query(ImportRecord).filter(ImportRecord.id == import_id).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="import not found")
+    return [
+        SimilarImportOut(import_id=similar_id, distance=distance)
+        for similar_id, distance in similar_imports(db, row, limit=limit)
+    ]
+
+
 @router.get("/{import_id}/file")
-def get_import_file(import_id: int, db: Session = Depends(get_db)):
+def get_import_file(import_id: int, request: Request, db: Session = Depends(get_db)):
     row = db.query(ImportRecord).filter(ImportRecord.id == import_id).first()
     if not row:
         raise HTTPException(status_code=404, detail="import not found")
 
-    file_path = import_pdf_path(import_id)
-    if not file_path.exists():
+    storage = get_storage()
+    key = source_pdf_key(row)
+    if not storage.exists(key):
         raise HTTPException(status_code=404, detail="file not found")
-    return FileResponse(
-        path=file_path,
+    return stream_object(
+        storage,
+        key,
         media_type="application/pdf",
+        range_header=request.headers.get("range"),
         headers={"Content-Disposition": "inline"},
     )
 
@@ -121,15 +338,17 @@ def get_import_preview(
     if not row:
         raise HTTPException(status_code=404, detail="import not found")
 
-    file_path = import_pdf_path(import_id)
-    if not file_path.exists():
+    storage = get_storage()
+    key = source_pdf_key(row)
+    if not storage.exists(key):
         raise HTTPException(status_code=404, detail="file not found")
-    preview_path = import_preview_path(import_id)
+    preview_key = import_preview_key(import_id)
 
-    if page == 1 and preview_path.exists():
-        return FileResponse(path=preview_path, media_type="image/png")
+    if page == 1 and storage.exists(preview_key):
+        return stream_object(storage, preview_key, media_type="image/png")
 
-    png = generate_preview_image(file_path, preview_path, page=page, zoom=zoom, cache=(page == 1))
+    with governor.acquire(pages=1, dpi=zoom * 72), storage.local_path(key) as file_path:
+        png = generate_preview_image(file_path, import_id, page=source_page(row, page), zoom=zoom, cache=(page == 1))
     return Response(content=png, media_type="image/png")
 
 
@@ -139,12 +358,12 @@ def delete_import(import_id: int, db: Session = Depends(get_db)):
     if not row:
         raise HTTPException(status_code=404, detail="import not found")
 
-    file_path = import_pdf_path(import_id)
-    if file_path.exists():
-        file_path.unlink()
-    preview_path = import_preview_path(import_id)
-    if preview_path.exists():
-        preview_path.unlink()
+    storage = get_storage()
+    if row.parent_id is None:
+        storage.delete(import_pdf_key(import_id))
+    storage.delete(import_preview_key(import_id))
+    for child in row.children:
+        storage.delete(import_preview_key(child.id))
 
     db.delete(row)
     db.commit()
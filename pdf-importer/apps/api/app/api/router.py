@@ -1,8 +1,10 @@
 from fastapi import APIRouter
 
+from app.api.exports import router as exports_router
 from app.api.imports import router as imports_router
 from app.api.models import router as models_router
 
 api_router = APIRouter()
 api_router.include_router(models_router)
 api_router.include_router(imports_router)
+api_router.include_router(exports_router)
@@ -1,19 +1,34 @@
+import logging
+import threading
 from contextlib import asynccontextmanager
-from pathlib import Path
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from app.api.router import api_router
 from app.core.config import settings
-from app.db.base import Base
 from app.db.session import engine
+from app.services.governor import AdmissionRejected, governor
+from app.services.warmup import check_schema_version, readiness, warm_up
+
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
-    Path("data/uploads").mkdir(parents=True, exist_ok=True)
-    Base.metadata.create_all(bind=engine)
+    try:
+        readiness.schema_error = check_schema_version(engine)
+    except Exception as exc:
+        readiness.schema_error = f"schema check failed: {exc}"
+    if readiness.schema_error:
+        logger.error(readiness.schema_error)
+
+    if settings.warmup_enabled:
+        # /health answers right away, /ready waits for the warm-up
+        threading.Thread(target=warm_up, name="warmup", daemon=True).start()
+    else:
+        readiness.warmed_up = True
     yield
 
 
@@ -27,9 +42,34 @@ app.add_middleware(
 )
 
 
+@app.exception_handler(AdmissionRejected)
+def admission_rejected(_: Request, exc: AdmissionRejected):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
 @app.get("/health")
 def health():
-    return {"status": "ok"}
+    load = governor.load_dict()
+    return {"status": "saturated" if load["saturated"] else "ok", "load": load}
+
+
+@app.get("/ready")
+def ready():
+    load = governor.load_dict()
+    checks = {
+        "schema": readiness.schema_error or "ok",
+        "warmup": "ok" if readiness.warmed_up else "pending",
+        "capacity": "saturated" if load["saturated"] else "ok",
+    }
+    is_ready = all(value == "ok" for value in checks.values())
+    return JSONResponse(
+        status_code=200 if is_ready else 503,
+        content={"status": "ready" if is_ready else "not ready", "checks": checks, "warmup_ms": readiness.warmup_timings_ms},
+    )
 
 
 app.include_router(api_router)
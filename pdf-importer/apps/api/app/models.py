@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, Text, func
+from sqlalchemy import BigInteger, DateTime, Float, ForeignKey, Integer, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -33,5 +33,54 @@ class ImportRecord(Base):
     ocr_text: Mapped[str | None] = mapped_column(Text, nullable=True)
     extracted_json: Mapped[str | None] = mapped_column(Text, nullable=True)
     error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    parent_id: Mapped[int | None] = mapped_column(ForeignKey("import_records.id"), nullable=True, index=True)
+    page_start: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    page_end: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    duplicate_of_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
 
     model: Mapped[ModelDefinition] = relationship("ModelDefinition", back_populates="imports")
+    parent: Mapped["ImportRecord | None"] = relationship(
+        "ImportRecord", remote_side="ImportRecord.id", back_populates="children"
+    )
+    children: Mapped[list["ImportRecord"]] = relationship(
+        "ImportRecord", back_populates="parent", cascade="all, delete-orphan", order_by="ImportRecord.page_start"
+    )
+    pages: Mapped[list["ImportPage"]] = relationship(
+        "ImportPage", back_populates="record", cascade="all, delete-orphan", order_by="ImportPage.page_number"
+    )
+    signature: Mapped["ImportSignature | None"] = relationship(
+        "ImportSignature", back_populates="record", cascade="all, delete-orphan", uselist=False
+    )
+
+
+class ImportPage(Base):
+    __tablename__ = "import_pages"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    import_id: Mapped[int] = mapped_column(ForeignKey("import_records.id", ondelete="CASCADE"), nullable=False, index=True)
+    page_number: Mapped[int] = mapped_column(Integer, nullable=False)
+    label: Mapped[str] = mapped_column(Text, nullable=False)
+    score: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    reason: Mapped[str | None] = mapped_column(Text, nullable=True)
+    status: Mapped[str] = mapped_column(Text, nullable=False, default="pending", server_default="pending")
+    engine: Mapped[str | None] = mapped_column(Text, nullable=True)
+    text: Mapped[str | None] = mapped_column(Text, nullable=True)
+    words: Mapped[str | None] = mapped_column(Text, nullable=True)
+    duration_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    record: Mapped[ImportRecord] = relationship("ImportRecord", back_populates="pages")
+
+
+class ImportSignature(Base):
+    __tablename__ = "import_signatures"
+
+    import_id: Mapped[int] = mapped_column(ForeignKey("import_records.id", ondelete="CASCADE"), primary_key=True)
+    simhash: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    band0: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    band1: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    band2: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    band3: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+
+    record: Mapped[ImportRecord] = relationship("ImportRecord", back_populates="signature")
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel
+
+from app.models import ImportPage, ImportRecord
+
+
+class Message(BaseModel):
+    message: str
+
+
+class ModelCreate(BaseModel):
+    name: str
+    json_schema: dict[str, Any]
+
+
+class ModelUpdate(BaseModel):
+    name: str
+    json_schema: dict[str, Any]
+
+
+class ModelOut(BaseModel):
+    id: int
+    name: str
+    json_schema: dict[str, Any]
+    created_at: datetime
+
+
+class ImportPageOut(BaseModel):
+    page_number: int
+    label: str
+    score: float
+    reason: str | None = None
+    status: str
+    engine: str | None = None
+    text: str | None = None
+    duration_ms: int | None = None
+    error: str | None = None
+    words: list[list[Any]] | None = None
+
+    @classmethod
+    def from_row(cls, row: ImportPage, include_words: bool = False) -> "ImportPageOut":
+        return cls(
+            page_number=row.page_number,
+            label=row.label,
+            score=row.score,
+            reason=row.reason,
+            status=row.status,
+            engine=row.engine,
+            text=row.text,
+            duration_ms=row.duration_ms,
+            error=row.error,
+            words=json.loads(row.words) if include_words and row.words else None,
+        )
+
+
+class SimilarImportOut(BaseModel):
+    import_id: int
+    distance: int
+
+
+class ImportOut(BaseModel):
+    id: int
+    model_id: int
+    filename: str
+    status: str
+    created_at: datetime
+    updated_at: datetime
+    ocr_text: str | None = None
+    extracted_json: dict[str, Any] | None = None
+    error: str | None = None
+    parent_id: int | None = None
+    page_start: int | None = None
+    page_end: int | None = None
+    duplicate_of_id: int | None = None
+
+    @classmethod
+    def from_row(cls, row: ImportRecord) -> "ImportOut":
+        return cls(
+            id=row.id,
+            model_id=row.model_id,
+            filename=row.filename,
+            status=row.status,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+            ocr_text=row.ocr_text,
+            extracted_json=json.loads(row.extracted_json) if row.extracted_json else None,
+            error=row.error,
+            parent_id=row.parent_id,
+            page_start=row.page_start,
+            page_end=row.page_end,
+            duplicate_of_id=row.duplicate_of_id,
+        )
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from itertools import combinations
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import ImportRecord, ImportSignature
+
+HASH_BITS = 64
+BANDS = 4
+BAND_BITS = HASH_BITS // BANDS
+MAX_PROBE_RADIUS = 2
+# two signatures d bits apart differ in at most r bits in some band when d < BANDS * (r + 1)
+MAX_DISTANCE = BANDS * (MAX_PROBE_RADIUS + 1) - 1
+SHINGLE_SIZE = 3
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def normalize_text(text: str) -> list[str]:
+    """Lower-cased word tokens; punctuation, layout and OCR spacing are dropped."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def simhash(text: str) -> int:
+    tokens = normalize_text(text)
+    if len(tokens) < SHINGLE_SIZE:
+        shingles = [" ".join(tokens)] if tokens else []
+    else:
+        shingles = [" ".join(tokens[i : i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)]
+
+    weights = [0] * HASH_BITS
+    for shingle in shingles:
+        value = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(HASH_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def bands(signature: int) -> list[int]:
+    mask = (1 << BAND_BITS) - 1
+    return [signature >> (i * BAND_BITS) & mask for i in range(BANDS)]
+
+
+def probe_radius(max_distance: int) -> int:
+    """Bits to flip per band so every signature within ``max_distance`` becomes a candidate."""
+    if not 0 <= max_distance <= MAX_DISTANCE:
+        raise ValueError(f"duplicate distance must be between 0 and {MAX_DISTANCE}, got {max_distance}")
+    return max_distance // BANDS
+
+
+def band_probes(part: int, radius: int) -> list[int]:
+    """``part`` and every band value at most ``radius`` bits away from it."""
+    probes = [part]
+    for flipped in range(1, radius + 1):
+        for positions in combinations(range(BAND_BITS), flipped):
+            probes.append(part ^ sum(1 << bit for bit in positions))
+    return probes
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def _to_signed(value: int) -> int:
+    return value - (1 << HASH_BITS) if value >= 1 << (HASH_BITS - 1) else value
+
+
+def _to_unsigned(value: int) -> int:
+    return value + (1 << HASH_BITS) if value < 0 else value
+
+
+def find_similar(
+    db: Session, signature: int, exclude_id: int | None = None, before_id: int | None = None, limit: int = 5
+) -> list[tuple[int, int]]:
+    """Return ``(import_id, distance)`` of stored signatures within the duplicate distance.
+
+    Candidates come from the band indexes. Each band is probed with its value
+    and every variant up to :func:`probe_radius` bits away, so no signature
+    within ``DUPLICATE_MAX_DISTANCE`` is missed; the exact distance is checked
+    afterwards. ``before_id`` limits the result to imports created earlier.
+    """
+    radius = probe_radius(settings.duplicate_max_distance)
+    parts = bands(signature)
+    query = db.query(ImportSignature.import_id, ImportSignature.simhash).filter(
+        or_(*(getattr(ImportSignature, f"band{i}").in_(band_probes(part, radius)) for i, part in enumerate(parts)))
+    )
+    if exclude_id is not None:
+        query = query.filter(ImportSignature.import_id != exclude_id)
+    if before_id is not None:
+        query = query.filter(ImportSignature.import_id < before_id)
+
+    matches = []
+    for import_id, stored in query:
+        distance = hamming(signature, _to_unsigned(stored))
+        if distance <= settings.duplicate_max_distance:
+            matches.append((import_id, distance))
+    matches.sort(key=lambda m: (m[1], m[0]))
+    return matches[:limit]
+
+
+def similar_imports(db: Session, record: ImportRecord, limit: int = 5) -> list[tuple[int, int]]:
+    if record.signature is None:
+        return []
+    return find_similar(db, _to_unsigned(record.signature.simhash), exclude_id=record.id, limit=limit)
+
+
+def register_signature(db: Session, record: ImportRecord) -> int | None:
+    """Store the signature of ``record.ocr_text`` and flag the closest earlier import."""
+    if not record.ocr_text or not record.ocr_text.strip():
+        return None
+    signature = simhash(record.ocr_text)
+    # only earlier imports, so a reprocessed original never points at its own duplicate
+    matches = find_similar(db, signature, before_id=record.id, limit=1)
+    record.duplicate_of_id = matches[0][0] if matches else None
+
+    parts = bands(signature)
+    record.signature = ImportSignature(
+        simhash=_to_signed(signature),
+        band0=parts[0],
+        band1=parts[1],
+        band2=parts[2],
+        band3=parts[3],
+    )
+    return record.duplicate_of_id
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models import ImportRecord
+
+EXPORT_BATCH_SIZE = 1000
+EXPLODED_ARRAY = "line_items"
+RECORD_COLUMNS = ("import_id", "model_id", "filename", "status", "created_at", "updated_at")
+
+
+class ExportError(RuntimeError):
+    pass
+
+
+@dataclass
+class ExportFilter:
+    model_id: int | None = None
+    status: str | None = None
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+
+
+@dataclass
+class Column:
+    name: str
+    path: tuple[str, ...]
+    type: str
+    in_line_item: bool = False
+
+
+def _resolve(spec: dict, root: dict) -> dict:
+    while isinstance(spec, dict) and "$ref" in spec:
+        ref = spec["$ref"]
+        if not ref.startswith("#/"):
+            raise ExportError(f"unsupported $ref: {ref}")
+        target = root
+        for part in ref[2:].split("/"):
+            target = target[part]
+        spec = target
+    return spec if isinstance(spec, dict) else {}
+
+
+def _schema_type(spec: dict) -> str | None:
+    """The type of ``spec`` with ``null`` dropped from unions like ``["number", "null"]``."""
+    kind = spec.get("type")
+    if not isinstance(kind, list):
+        return kind
+    members = [member for member in kind if member != "null"]
+    if len(members) == 1:
+        return members[0]
+    if members and set(members) <= {"integer", "number"}:
+        return "number"
+    return None
+
+
+def schema_columns(json_schema: dict) -> list[Column]:
+    """Flatten a model schema into dotted column names.
+
+    Nested objects become ``seller.address.city``; the items of ``line_items``
+    become ``line_items.<field>`` and are exploded into one row each. Any other
+    array is exported as a JSON string.
+    """
+    columns: list[Column] = []
+
+    def walk(spec: dict, path: tuple[str, ...], in_line_item: bool) -> None:
+        spec = _resolve(spec, json_schema)
+        kind = _schema_type(spec)
+        properties = spec.get("properties")
+        if kind == "object" and properties:
+            for key, child in properties.items():
+                walk(child, path + (key,), in_line_item)
+            return
+        if kind == "array" and path == (EXPLODED_ARRAY,) and not in_line_item:
+            walk(spec.get("items", {}), path, True)
+            return
+        column_type = kind if kind in {"integer", "number", "boolean"} else "string"
+        columns.append(Column(".".join(path), path, column_type, in_line_item))
+
+    walk(json_schema, (), False)
+    return columns
+
+
+def _lookup(data, path: tuple[str, ...]):
+    for key in path:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
+def _cell(value, column_type: str):
+    if value is None:
+        return None
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    if column_type == "integer":
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+    if column_type == "number":
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+    if column_type == "boolean":
+        return value if isinstance(value, bool) else None
+    return str(value)
+
+
+def flatten_rows(record: dict, extracted: dict, columns: list[Column]) -> Iterator[dict]:
+    base = dict(record)
+    for column in columns:
+        if not column.in_line_item:
+            base[column.name] = _cell(_lookup(extracted, column.path), column.type)
+
+    items = extracted.get(EXPLODED_ARRAY) if isinstance(extracted, dict) else None
+    line_columns = [c for c in columns if c.in_line_item]
+    if not line_columns or not isinstance(items, list) or not items:
+        yield {**base, **{c.name: None for c in line_columns}}
+        return
+    for item in items:
+        row = dict(base)
+        for column in line_columns:
+            row[column.name] = _cell(_lookup(item, column.path[1:]), column.type)
+        yield row
+
+
+def iter_records(db: Session, filters: ExportFilter, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[tuple[dict, dict]]:
+    """Yield ``(record, extracted)`` pairs using a server-side cursor where the driver supports one."""
+    stmt = select(
+        ImportRecord.id,
+        ImportRecord.model_id,
+        ImportRecord.filename,
+        ImportRecord.status,
+        ImportRecord.created_at,
+        ImportRecord.updated_at,
+        ImportRecord.extracted_json,
+    ).order_by(ImportRecord.id)
+    if filters.model_id is not None:
+        stmt = stmt.where(ImportRecord.model_id == filters.model_id)
+    if filters.status is not None:
+        stmt = stmt.where(ImportRecord.status == filters.status)
+    if filters.created_from is not None:
+        stmt = stmt.where(ImportRecord.created_at >= filters.created_from)
+    if filters.created_to is not None:
+        stmt = stmt.where(ImportRecord.created_at < filters.created_to)
+
+    result = db.execute(stmt.execution_options(stream_results=True, yield_per=batch_size))
+    for row in result:
+        record = {
+            "import_id": row.id,
+            "model_id": row.model_id,
+            "filename": row.filename,
+            "status": row.status,
+            "created_at": row.created_at.isoformat() if row.created_at else None,
+            "updated_at": row.updated_at.isoformat() if row.updated_at else None,
+        }
+        extracted = json.loads(row.extracted_json) if row.extracted_json else {}
+        yield record, extracted
+
+
+def export_ndjson(records: Iterator[tuple[dict, dict]], batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[bytes]:
+    buffer: list[str] = []
+    for record, extracted in records:
+        buffer.append(json.dumps({**record, "data": extracted}, ensure_ascii=False, default=str))
+        if len(buffer) >= batch_size:
+            yield ("\n".join(buffer) + "\n").encode("utf-8")
+            buffer.clear()
+    if buffer:
+        yield ("\n".join(buffer) + "\n").encode("utf-8")
+
+
+def export_csv(
+    records: Iterator[tuple[dict, dict]], columns: list[Column], batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[bytes]:
+    out = io.StringIO()
+    fieldnames = list(RECORD_COLUMNS) + [c.name for c in columns]
+    writer = csv.DictWriter(out, fieldnames=fieldnames)
+    writer.writeheader()
+    pending = 0
+    for record, extracted in records:
+        for row in flatten_rows(record, extracted, columns):
+            writer.writerow(row)
+            pending += 1
+        if pending >= batch_size:
+            yield out.getvalue().encode("utf-8")
+            out.seek(0)
+            out.truncate()
+            pending = 0
+    yield out.getvalue().encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object whose contents are handed out as they arrive."""
+
+    def __init__(self):
+        self.chunks: list[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def export_parquet(
+    records: Iterator[tuple[dict, dict]], columns: list[Column], batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[bytes]:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise ExportError("pyarrow is required for parquet export") from exc
+
+    arrow_types = {"integer": pa.int64(), "number": pa.float64(), "boolean": pa.bool_(), "string": pa.string()}
+    fields = [pa.field(name, pa.int64() if name in {"import_id", "model_id"} else pa.string()) for name in RECORD_COLUMNS]
+    fields += [pa.field(c.name, arrow_types[c.type]) for c in columns]
+    schema = pa.schema(fields)
+
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    batch: list[dict] = []
+
+    def flush():
+        writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+        batch.clear()
+
+    try:
+        for record, extracted in records:
+            batch.extend(flatten_rows(record, extracted, columns))
+            if len(batch) >= batch_size:
+                flush()
+                yield sink.drain()
+        if batch:
+            flush()
+    finally:
+        writer.close()
+    yield sink.drain()
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+
+from app.core.config import settings
+
+# A4 at 1 dpi, in inches, and 3 bytes per RGB pixel
+PAGE_WIDTH_IN = 8.27
+PAGE_HEIGHT_IN = 11.69
+BYTES_PER_PIXEL = 3
+
+
+class AdmissionRejected(RuntimeError):
+    def __init__(self, retry_after: int):
+        super().__init__(f"server is busy, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+@dataclass
+class Load:
+    inflight_requests: int
+    inflight_pages: int
+    inflight_memory_mb: float
+    queued: int
+    max_pages: int
+    max_memory_mb: int
+    saturated: bool
+
+
+def estimate_bytes(pages: int, dpi: float) -> int:
+    """Raster memory needed to render ``pages`` A4 pages at ``dpi``."""
+    return int(pages * (PAGE_WIDTH_IN * dpi) * (PAGE_HEIGHT_IN * dpi) * BYTES_PER_PIXEL)
+
+
+class ResourceGovernor:
+    """Bounds the pages and raster memory that are being rendered or OCRed at once.
+
+    Requests that do not fit wait up to ``queue_timeout`` seconds in a bounded
+    queue and are rejected with :class:`AdmissionRejected` otherwise. A request
+    larger than the limits on its own is still admitted when nothing else runs.
+    """
+
+    def __init__(self, max_pages: int, max_memory_mb: int, max_queue: int, queue_timeout: float):
+        self.max_pages = max_pages
+        self.max_memory_bytes = max_memory_mb * 1024 * 1024
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._cond = threading.Condition()
+        self._requests = 0
+        self._pages = 0
+        self._bytes = 0
+        self._queued = 0
+        self._avg_hold = 1.0
+
+    def _fits(self, pages: int, nbytes: int) -> bool:
+        if self._requests == 0:
+            return True
+        return self._pages + pages <= self.max_pages and self._bytes + nbytes <= self.max_memory_bytes
+
+    def _retry_after(self) -> int:
+        return max(1, math.ceil(self._avg_hold * (self._queued + 1) / max(self._requests, 1)))
+
+    @contextmanager
+    def acquire(self, pages: int, dpi: float) -> Iterator[None]:
+        pages = max(pages, 1)
+        nbytes = estimate_bytes(pages, dpi)
+        with self._cond:
+            if not self._fits(pages, nbytes):
+                if self._queued >= self.max_queue:
+                    raise AdmissionRejected(self._retry_after())
+                self._queued += 1
+                try:
+                    deadline = time.monotonic() + self.queue_timeout
+                    while not self._fits(pages, nbytes):
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise AdmissionRejected(self._retry_after())
+                        self._cond.wait(remaining)
+                finally:
+                    self._queued -= 1
+            self._requests += 1
+            self._pages += pages
+            self._bytes += nbytes
+
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._requests -= 1
+                self._pages -= pages
+                self._bytes -= nbytes
+                self._avg_hold = 0.8 * self._avg_hold + 0.2 * (time.monotonic() - started)
+                self._cond.notify_all()
+
+    def load(self) -> Load:
+        with self._cond:
+            return Load(
+                inflight_requests=self._requests,
+                inflight_pages=self._pages,
+                inflight_memory_mb=round(self._bytes / (1024 * 1024), 1),
+                queued=self._queued,
+                max_pages=self.max_pages,
+                max_memory_mb=self.max_memory_bytes // (1024 * 1024),
+                saturated=self._queued > 0
+                or self._pages >= self.max_pages
+                or self._bytes >= self.max_memory_bytes,
+            )
+
+    def load_dict(self) -> dict:
+        return asdict(self.load())
+
+
+governor = ResourceGovernor(
+    max_pages=settings.admission_max_pages,
+    max_memory_mb=settings.admission_max_memory_mb,
+    max_queue=settings.admission_max_queue,
+    queue_timeout=settings.admission_queue_timeout,
+)
@@ -2,8 +2,7 @@ from __future__ import annotations
 
 import json
 import logging
-
-from openai import OpenAI
+from functools import lru_cache
 
 from app.core.config import settings
 
@@ -49,12 +48,20 @@ def _fallback_from_schema(json_schema: dict) -> dict:
     return result
 
 
+@lru_cache
+def get_client():
+    """Shared client so its HTTP connection pool is reused across imports."""
+    from openai import OpenAI
+
+    return OpenAI(api_key=settings.openai_api_key, base_url=settings.openai_base_url or None)
+
+
 def extract_with_llm(text: str, json_schema: dict) -> dict:
     if not settings.openai_api_key:
         logger.warning("OPENAI_API_KEY is missing, using schema fallback output")
         return _fallback_from_schema(json_schema)
 
-    client = OpenAI(api_key=settings.openai_api_key)
+    client = get_client()
 
     system_prompt = (
         "You extract structured data from OCR text and output strict JSON only. "
@@ -1,25 +1,70 @@
 from __future__ import annotations
 
-import fitz
-import pytesseract
-from pdf2image import convert_from_path
+import time
+from dataclasses import dataclass, field
 
 from app.core.config import settings
 
+ENGINE_NATIVE = "native"
+ENGINE_OCR = "ocr"
 
-def extract_pdf_text(pdf_path):
-    text = _extract_text_native(pdf_path)
+
+@dataclass
+class PageText:
+    page_number: int
+    text: str
+    engine: str
+    duration_ms: int
+    # [x0, y0, x1, y1, word] in PDF points
+    words: list[list] = field(default_factory=list)
+
+
+def open_pdf(pdf_path):
+    import fitz
+
+    return fitz.open(pdf_path)
+
+
+def extract_page_text(doc, pdf_path, page_number: int) -> PageText:
+    """Text of one page from its text layer, falling back to OCR when the page has none."""
+    started = time.perf_counter()
+    page = doc.load_page(page_number - 1)
+    text = page.get_text("text")
     if text.strip():
-        return text
-    return _extract_text_ocr(pdf_path)
+        words = [[round(w[0], 1), round(w[1], 1), round(w[2], 1), round(w[3], 1), w[4]] for w in page.get_text("words")]
+        engine = ENGINE_NATIVE
+    else:
+        text, words = _ocr_page(pdf_path, page_number)
+        engine = ENGINE_OCR
+    return PageText(page_number, text, engine, int((time.perf_counter() - started) * 1000), words)
 
 
-def _extract_text_native(pdf_path):
-    with fitz.open(pdf_path) as doc:
-        return "\n".join(page.get_text("text") for page in doc)
+def _ocr_page(pdf_path, page_number: int) -> tuple[str, list[list]]:
+    import pytesseract
+    from pdf2image import convert_from_path
 
+    images = convert_from_path(str(pdf_path), dpi=settings.ocr_dpi, first_page=page_number, last_page=page_number)
+    if not images:
+        return "", []
+    data = pytesseract.image_to_data(images[0], lang=settings.ocr_lang, output_type=pytesseract.Output.DICT)
 
-def _extract_text_ocr(pdf_path):
-    images = convert_from_path(str(pdf_path), dpi=300)
-    page_texts = [pytesseract.image_to_string(img, lang=settings.ocr_lang) for img in images]
-    return "\n".join(page_texts)
+    scale = 72 / settings.ocr_dpi
+    words = []
+    lines: dict[tuple[int, int, int], list[str]] = {}
+    for i, word in enumerate(data["text"]):
+        word = word.strip()
+        if not word:
+            continue
+        left, top, width, height = data["left"][i], data["top"][i], data["width"][i], data["height"][i]
+        words.append(
+            [
+                round(left * scale, 1),
+                round(top * scale, 1),
+                round((left + width) * scale, 1),
+                round((top + height) * scale, 1),
+                word,
+            ]
+        )
+        lines.setdefault((data["block_num"][i], data["par_num"][i], data["line_num"][i]), []).append(word)
+    text = "\n".join(" ".join(line) for line in lines.values())
+    return text, words
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from app.services.llm import INVOICE_EXTRACTION_RULES
+
+if TYPE_CHECKING:
+    import fitz
+
+PAGE_INVOICE = "invoice"
+PAGE_IRRELEVANT = "irrelevant"
+PAGE_BLANK = "blank"
+
+THUMBNAIL_ZOOM = 0.15
+INK_THRESHOLD = 200
+BLANK_INK_RATIO = 0.003
+SCAN_MIN_COVERAGE = 0.5
+
+IRRELEVANT_KEYWORDS = (
+    "allgemeine geschäftsbedingungen",
+    "allgemeine geschaeftsbedingungen",
+    "agb",
+    "geltungsbereich",
+    "eigentumsvorbehalt",
+    "gerichtsstand",
+    "haftung",
+    "widerruf",
+    "datenschutz",
+    "lieferschein",
+    "terms and conditions",
+    "delivery note",
+    "packing slip",
+)
+
+_DARK_BYTES = bytes(range(INK_THRESHOLD))
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass
+class PageDecision:
+    page_number: int
+    label: str
+    score: float
+    reason: str
+
+    @property
+    def is_relevant(self) -> bool:
+        return self.label == PAGE_INVOICE
+
+
+@lru_cache
+def invoice_keywords() -> tuple[str, ...]:
+    """Label synonyms listed in the LLM extraction rules, lower-cased."""
+    keywords = {"rechnung", "invoice"}
+    for line in INVOICE_EXTRACTION_RULES.splitlines():
+        line = line.strip()
+        if line.startswith("Normalization rules"):
+            break
+        if not line.startswith("- ") or ":" not in line:
+            continue
+        _, synonyms = line[2:].split(":", 1)
+        for synonym in synonyms.replace("(", ",").replace(")", ",").split(","):
+            synonym = synonym.strip().lower()
+            if len(synonym) > 3 and not synonym.startswith("or "):
+                keywords.add(synonym)
+    return tuple(sorted(keywords))
+
+
+def _count_hits(text: str, keywords: tuple[str, ...]) -> int:
+    words = set(_WORD_RE.findall(text))
+    hits = 0
+    for keyword in keywords:
+        if " " in keyword:
+            hits += keyword in text
+        else:
+            hits += keyword in words
+    return hits
+
+
+def _ink_ratio(page: fitz.Page) -> float:
+    import fitz
+
+    pix = page.get_pixmap(matrix=fitz.Matrix(THUMBNAIL_ZOOM, THUMBNAIL_ZOOM), colorspace=fitz.csGRAY, alpha=False)
+    samples = pix.samples
+    if not samples:
+        return 0.0
+    dark = len(samples) - len(samples.translate(None, _DARK_BYTES))
+    return dark / len(samples)
+
+
+def image_coverage(page: fitz.Page) -> float:
+    import fitz
+
+    page_area = abs(page.rect) or 1.0
+    covered = sum(abs(fitz.Rect(info["bbox"]) & page.rect) for info in page.get_image_info())
+    return min(covered / page_area, 1.0)
+
+
+def classify_text(page_number: int, text: str) -> PageDecision:
+    """Keyword decision for a page's text, also used on OCR output of scanned pages."""
+    text = text.lower()
+    if not text.strip():
+        return PageDecision(page_number, PAGE_BLANK, 0.0, "no text")
+    positive = _count_hits(text, invoice_keywords())
+    negative = _count_hits(text, IRRELEVANT_KEYWORDS)
+    score = float(positive - negative)
+    reason = f"invoice keywords {positive}, irrelevant keywords {negative}"
+    if negative > 0 and positive <= negative:
+        return PageDecision(page_number, PAGE_IRRELEVANT, score, reason)
+    return PageDecision(page_number, PAGE_INVOICE, score, reason)
+
+
+def classify_page(page: fitz.Page) -> PageDecision:
+    page_number = page.number + 1
+    text = page.get_text("text")
+
+    if not text.strip():
+        ink = _ink_ratio(page)
+        if ink < BLANK_INK_RATIO:
+            return PageDecision(page_number, PAGE_BLANK, 0.0, f"no text, ink ratio {ink:.4f}")
+        coverage = image_coverage(page)
+        reason = f"no text, ink ratio {ink:.4f}, image coverage {coverage:.2f}"
+        if coverage < SCAN_MIN_COVERAGE:
+            # logos, stamps or drawings only: nothing OCR could turn into invoice data
+            return PageDecision(page_number, PAGE_IRRELEVANT, 0.0, reason)
+        # scanned pages carry no text layer, so keep them and let the OCR text decide
+        return PageDecision(page_number, PAGE_INVOICE, 0.0, reason)
+
+    return classify_text(page_number, text)
+
+
+def classify_pages(pdf_path, pages: list[int] | None = None) -> list[PageDecision]:
+    import fitz
+
+    with fitz.open(pdf_path) as doc:
+        numbers = pages if pages is not None else range(1, doc.page_count + 1)
+        decisions = [classify_page(doc.load_page(n - 1)) for n in numbers]
+
+    if decisions and not any(d.is_relevant for d in decisions):
+        # never drop a whole document on heuristics alone; a sparse scan can
+        # also fall under the blank ink ratio on the thumbnail
+        for decision in decisions:
+            if decision.label in (PAGE_IRRELEVANT, PAGE_BLANK):
+                decision.label = PAGE_INVOICE
+                decision.reason += "; kept, no invoice page detected"
+    return decisions
+
+
+def select_pages(decisions: list[PageDecision]) -> list[int]:
+    return [d.page_number for d in decisions if d.is_relevant]
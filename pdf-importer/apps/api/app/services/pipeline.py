@@ -2,20 +2,112 @@ from __future__ import annotations
 
 import json
 import logging
+from functools import lru_cache
 from pathlib import Path
 
-from jsonschema import validate
+from sqlalchemy.orm import Session
 
-from app.models import ImportRecord, ModelDefinition
+from app.core.config import settings
+from app.models import ImportPage, ImportRecord, ModelDefinition
 from app.services.llm import extract_with_llm
-from app.services.ocr import extract_pdf_text
+from app.services.ocr import ENGINE_OCR, extract_page_text, open_pdf
+from app.services.page_classifier import PAGE_INVOICE, classify_pages, classify_text, select_pages
 
 logger = logging.getLogger(__name__)
 
+PAGE_PENDING = "pending"
+PAGE_DONE = "done"
+PAGE_FAILED = "failed"
+PAGE_SKIPPED = "skipped"
 
-def process_import(record: ImportRecord, model: ModelDefinition, file_path: Path) -> tuple[str, str]:
+
+@lru_cache(maxsize=128)
+def schema_validator(json_schema: str):
+    """Check the schema once and reuse the compiled validator for every import of a model."""
+    from jsonschema.validators import validator_for
+
+    schema = json.loads(json_schema)
+    cls = validator_for(schema)
+    cls.check_schema(schema)
+    return cls(schema)
+
+
+def _plan_pages(record: ImportRecord, doc, file_path: Path) -> list[ImportPage]:
+    if record.page_start is not None:
+        numbers = list(range(record.page_start, record.page_end + 1))
+    else:
+        numbers = list(range(1, doc.page_count + 1))
+    if not settings.page_classification_enabled:
+        return [ImportPage(page_number=n, label=PAGE_INVOICE, score=0.0, status=PAGE_PENDING) for n in numbers]
+
+    decisions = classify_pages(file_path, pages=numbers)
+    keep = set(select_pages(decisions))
+    logger.info("import id=%s keeps %s of %s pages", record.id, len(keep), len(decisions))
+    return [
+        ImportPage(
+            page_number=d.page_number,
+            label=d.label,
+            score=d.score,
+            reason=d.reason,
+            status=PAGE_PENDING if d.page_number in keep else PAGE_SKIPPED,
+        )
+        for d in decisions
+    ]
+
+
+def _extract_pages(record: ImportRecord, doc, file_path: Path, db: Session) -> None:
+    """Extract every page that is not done yet, committing after each one.
+
+    Pages finished by an earlier attempt are kept, so a retry resumes at the
+    first page that is still pending or failed.
+    """
+    for page in record.pages:
+        if page.status not in (PAGE_PENDING, PAGE_FAILED):
+            continue
+        try:
+            result = extract_page_text(doc, file_path, page.page_number)
+        except Exception as exc:
+            page.status = PAGE_FAILED
+            page.error = str(exc)
+            db.commit()
+            raise
+        page.status = PAGE_DONE
+        page.engine = result.engine
+        page.text = result.text
+        page.words = json.dumps(result.words, ensure_ascii=False)
+        page.duration_ms = result.duration_ms
+        page.error = None
+        if result.engine == ENGINE_OCR and settings.page_classification_enabled:
+            # scans had no text to classify before OCR
+            decision = classify_text(page.page_number, result.text)
+            page.label, page.score, page.reason = decision.label, decision.score, decision.reason
+        db.commit()
+
+
+def _llm_text(record: ImportRecord) -> str:
+    done = [page for page in record.pages if page.status == PAGE_DONE]
+    relevant = [page for page in done if page.label == PAGE_INVOICE]
+    return "\n".join(page.text for page in relevant or done)
+
+
+def process_import(record: ImportRecord, model: ModelDefinition, file_path: Path, db: Session) -> tuple[str, str]:
     logger.info("processing import id=%s", record.id)
-    text = extract_pdf_text(file_path)
+    with open_pdf(file_path) as doc:
+        if not record.pages:
+            record.pages = _plan_pages(record, doc, file_path)
+            db.add(record)
+            db.commit()
+        _extract_pages(record, doc, file_path, db)
+        if not any(page.status == PAGE_DONE and page.label == PAGE_INVOICE for page in record.pages):
+            # OCR found no invoice page either, so fall back to the pages skipped up front
+            skipped = [page for page in record.pages if page.status == PAGE_SKIPPED]
+            for page in skipped:
+                page.status = PAGE_PENDING
+            if skipped:
+                db.commit()
+                _extract_pages(record, doc, file_path, db)
+
+    text = _llm_text(record)
     extracted = extract_with_llm(text=text, json_schema=json.loads(model.json_schema))
-    validate(instance=extracted, schema=json.loads(model.json_schema))
+    schema_validator(model.json_schema).validate(extracted)
     return text, json.dumps(extracted, ensure_ascii=False)
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import logging
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from app.core.config import settings
+from app.services.page_classifier import (
+    PAGE_BLANK,
+    PAGE_INVOICE,
+    SCAN_MIN_COVERAGE,
+    classify_page,
+    classify_text,
+    image_coverage,
+    invoice_keywords,
+)
+
+if TYPE_CHECKING:
+    import fitz
+
+INVOICE_NUMBER_RE = re.compile(
+    r"(?:rechnungs?-?(?:nummer|nr\.?)|rechnung\s+nr\.?|belegnummer|dokumentnummer|invoice\s*(?:no\.?|number|#))"
+    r"\s*[:#]?\s*([a-z0-9][a-z0-9\-/.]{2,})",
+    re.IGNORECASE,
+)
+PAGE_MARKER_RE = re.compile(r"\b(?:seite|page|blatt)\s+(\d+)\s*(?:von|of|/)\s*(\d+)\b", re.IGNORECASE)
+LAYOUT_TOLERANCE = 0.05
+# scans have no text layer: OCR the header and footer bands at low resolution
+SIGNAL_OCR_DPI = 150
+SIGNAL_BANDS = ((0.0, 0.4), (0.85, 1.0))
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PageSignals:
+    page_number: int
+    blank: bool
+    invoice_page: bool
+    invoice_number: str | None
+    marker: tuple[int, int] | None
+    size: tuple[float, float]
+    invoice_keyword_hits: int
+
+
+def _signal_ocr_text(page: fitz.Page) -> str:
+    import fitz
+    import pytesseract
+    from PIL import Image
+
+    parts = []
+    zoom = SIGNAL_OCR_DPI / 72
+    for top, bottom in SIGNAL_BANDS:
+        rect = page.rect
+        clip = fitz.Rect(rect.x0, rect.y0 + rect.height * top, rect.x1, rect.y0 + rect.height * bottom)
+        pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), clip=clip, colorspace=fitz.csGRAY, alpha=False)
+        image = Image.frombytes("L", (pix.width, pix.height), pix.samples)
+        parts.append(pytesseract.image_to_string(image, lang=settings.ocr_lang))
+    return "\n".join(parts)
+
+
+def _page_signals(page: fitz.Page) -> PageSignals:
+    text = page.get_text("text")
+    decision = classify_page(page)
+    # a sparse scan can look blank on the thumbnail, so scans are OCRed even then
+    if not text.strip() and (decision.label != PAGE_BLANK or image_coverage(page) >= SCAN_MIN_COVERAGE):
+        try:
+            text = _signal_ocr_text(page)
+        except Exception:
+            # without OCR only blank separator pages split a scan
+            logger.warning("header OCR failed on page %s, no split signals", page.number + 1, exc_info=True)
+        else:
+            if text.strip():
+                decision = classify_text(page.number + 1, text)
+    number_match = INVOICE_NUMBER_RE.search(text)
+    marker_match = PAGE_MARKER_RE.search(text)
+    lowered = text.lower()
+    return PageSignals(
+        page_number=page.number + 1,
+        blank=decision.label == PAGE_BLANK,
+        invoice_page=decision.label == PAGE_INVOICE,
+        invoice_number=number_match.group(1).rstrip(".").upper() if number_match else None,
+        marker=(int(marker_match.group(1)), int(marker_match.group(2))) if marker_match else None,
+        size=(page.rect.width, page.rect.height),
+        invoice_keyword_hits=sum(keyword in lowered for keyword in invoice_keywords()),
+    )
+
+
+def _layout_changed(a: tuple[float, float], b: tuple[float, float]) -> bool:
+    return any(abs(x - y) > LAYOUT_TOLERANCE * max(x, y) for x, y in zip(a, b))
+
+
+def _starts_new_document(current: list[PageSignals], page: PageSignals, doc_invoice_number: str | None) -> bool:
+    previous = current[-1]
+    if page.marker and page.marker[0] == 1:
+        return True
+    if previous.marker and previous.marker[0] == previous.marker[1]:
+        return True
+    if page.invoice_number and doc_invoice_number and page.invoice_number != doc_invoice_number:
+        return True
+    # a different page format only counts when the new page looks like an invoice header
+    return _layout_changed(previous.size, page.size) and page.invoice_keyword_hits >= 2
+
+
+def _segments(signals: list[PageSignals]) -> list[list[PageSignals]]:
+    segments: list[list[PageSignals]] = []
+    current: list[PageSignals] = []
+    doc_invoice_number: str | None = None
+
+    def close():
+        if current:
+            segments.append(list(current))
+            current.clear()
+
+    for page in signals:
+        if page.blank:
+            close()
+            doc_invoice_number = None
+            continue
+        if current and _starts_new_document(current, page, doc_invoice_number):
+            close()
+            doc_invoice_number = None
+        current.append(page)
+        doc_invoice_number = doc_invoice_number or page.invoice_number
+    close()
+    return segments
+
+
+def detect_documents(pdf_path) -> list[tuple[int, int]]:
+    """Split a batch scan into inclusive ``(first_page, last_page)`` ranges, one per invoice.
+
+    Blank pages act as separators. Pages without a text layer get their
+    signals from a low-resolution OCR of the header and footer bands. A segment without any invoice page (terms,
+    delivery notes) never becomes a document of its own: it is attached to the
+    preceding invoice, or to the following one when it leads the file, so a
+    range may include the separator pages in between.
+    """
+    import fitz
+
+    with fitz.open(pdf_path) as doc:
+        signals = [_page_signals(page) for page in doc]
+
+    segments = _segments(signals)
+    ranges: list[tuple[int, int]] = []
+    leading_start: int | None = None
+    for segment in segments:
+        first, last = segment[0].page_number, segment[-1].page_number
+        if not any(page.invoice_page for page in segment):
+            if ranges:
+                ranges[-1] = (ranges[-1][0], last)
+            elif leading_start is None:
+                leading_start = first
+            continue
+        ranges.append((leading_start or first, last))
+        leading_start = None
+
+    if not ranges and segments:
+        return [(segments[0][0].page_number, segments[-1][-1].page_number)]
+    return ranges
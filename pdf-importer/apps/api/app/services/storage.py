@@ -1,25 +1,231 @@
 from __future__ import annotations
 
+import hashlib
+import os
+import shutil
+import tempfile
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
+from typing import BinaryIO
 
 from app.core.config import settings
 
+CHUNK_SIZE = 256 * 1024
 
-def ensure_upload_dir() -> Path:
-    upload_dir = Path(settings.upload_dir)
-    upload_dir.mkdir(parents=True, exist_ok=True)
-    return upload_dir
 
+class StorageError(RuntimeError):
+    pass
 
-def import_pdf_path(import_id: int) -> Path:
-    return ensure_upload_dir() / f"{import_id}.pdf"
 
+class StorageBackend(ABC):
+    @abstractmethod
+    def save(self, key: str, data: bytes) -> None: ...
 
-def ensure_preview_dir() -> Path:
-    preview_dir = Path("./data/previews")
-    preview_dir.mkdir(parents=True, exist_ok=True)
-    return preview_dir
+    @abstractmethod
+    def save_fileobj(self, key: str, fileobj: BinaryIO) -> None: ...
 
+    @abstractmethod
+    def exists(self, key: str) -> bool: ...
 
-def import_preview_path(import_id: int) -> Path:
-    return ensure_preview_dir() / f"{import_id}.png"
+    @abstractmethod
+    def size(self, key: str) -> int: ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    def iter_bytes(
+        self, key: str, start: int = 0, end: int | None = None, chunk_size: int = CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        """Yield the bytes of ``key`` from ``start`` up to and including ``end``."""
+
+    @abstractmethod
+    @contextmanager
+    def local_path(self, key: str) -> Iterator[Path]:
+        """Provide a filesystem path for libraries that cannot read from a stream."""
+
+    def read_bytes(self, key: str) -> bytes:
+        return b"".join(self.iter_bytes(key))
+
+
+class LocalStorage(StorageBackend):
+    """Filesystem backend that fans files out into hashed subdirectories.
+
+    ``uploads/123.pdf`` is stored as ``<root>/uploads/ab/cd/123.pdf`` so no single
+    directory grows beyond a few thousand entries. Files written before sharding
+    (``<root>/uploads/123.pdf``) are still found and deleted, new writes always
+    go to the sharded path.
+    """
+
+    def __init__(self, root: str | Path, shard_depth: int = 2):
+        self.root = Path(root)
+        self.shard_depth = shard_depth
+
+    def _path(self, key: str) -> Path:
+        prefix, _, name = key.rpartition("/")
+        digest = hashlib.sha1(name.encode("utf-8")).hexdigest()
+        shards = [digest[i * 2 : i * 2 + 2] for i in range(self.shard_depth)]
+        return self.root.joinpath(prefix, *shards, name)
+
+    def _existing_path(self, key: str) -> Path:
+        path = self._path(key)
+        if not path.is_file():
+            legacy = self.root / key
+            if legacy.is_file():
+                return legacy
+        return path
+
+    def save(self, key: str, data: bytes) -> None:
+        self._write(key, lambda fh: fh.write(data))
+
+    def save_fileobj(self, key: str, fileobj: BinaryIO) -> None:
+        self._write(key, lambda fh: shutil.copyfileobj(fileobj, fh, CHUNK_SIZE))
+
+    def _write(self, key: str, writer) -> None:
+        target = self._path(key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        # write-then-rename keeps readers on other replicas from seeing partial files
+        fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                writer(fh)
+            os.replace(tmp_name, target)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def exists(self, key: str) -> bool:
+        return self._existing_path(key).is_file()
+
+    def size(self, key: str) -> int:
+        try:
+            return self._existing_path(key).stat().st_size
+        except FileNotFoundError as exc:
+            raise StorageError(f"object not found: {key}") from exc
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+        (self.root / key).unlink(missing_ok=True)
+
+    def iter_bytes(
+        self, key: str, start: int = 0, end: int | None = None, chunk_size: int = CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        path = self._existing_path(key)
+        if not path.is_file():
+            raise StorageError(f"object not found: {key}")
+        return self._iter_file(path, start, end, chunk_size)
+
+    @staticmethod
+    def _iter_file(path: Path, start: int, end: int | None, chunk_size: int) -> Iterator[bytes]:
+        with path.open("rb") as fh:
+            fh.seek(start)
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                chunk = fh.read(chunk_size if remaining is None else min(chunk_size, remaining))
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    @contextmanager
+    def local_path(self, key: str) -> Iterator[Path]:
+        path = self._existing_path(key)
+        if not path.is_file():
+            raise StorageError(f"object not found: {key}")
+        yield path
+
+
+class S3Storage(StorageBackend):
+    """Backend for S3-compatible object stores such as AWS S3 or MinIO."""
+
+    def __init__(self, bucket: str, client=None):
+        self.bucket = bucket
+        if client is None:
+            try:
+                import boto3
+            except ImportError as exc:
+                raise StorageError("boto3 is required for STORAGE_BACKEND=s3") from exc
+            client = boto3.client(
+                "s3",
+                endpoint_url=settings.s3_endpoint_url or None,
+                region_name=settings.s3_region or None,
+                aws_access_key_id=settings.s3_access_key or None,
+                aws_secret_access_key=settings.s3_secret_key or None,
+            )
+        self.client = client
+
+    @staticmethod
+    def _is_missing(exc: Exception) -> bool:
+        error = getattr(exc, "response", {}).get("Error", {})
+        return str(error.get("Code")) in {"404", "NoSuchKey", "NotFound"}
+
+    def _head(self, key: str) -> dict:
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=key)
+        except Exception as exc:
+            if self._is_missing(exc):
+                raise StorageError(f"object not found: {key}") from exc
+            raise
+
+    def save(self, key: str, data: bytes) -> None:
+        self.client.put_object(Bucket=self.bucket, Key=key, Body=data)
+
+    def save_fileobj(self, key: str, fileobj: BinaryIO) -> None:
+        self.client.upload_fileobj(fileobj, self.bucket, key)
+
+    def exists(self, key: str) -> bool:
+        try:
+            self._head(key)
+        except StorageError:
+            return False
+        return True
+
+    def size(self, key: str) -> int:
+        return int(self._head(key)["ContentLength"])
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    def iter_bytes(
+        self, key: str, start: int = 0, end: int | None = None, chunk_size: int = CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        params = {"Bucket": self.bucket, "Key": key}
+        if start or end is not None:
+            params["Range"] = f"bytes={start}-{'' if end is None else end}"
+        try:
+            body = self.client.get_object(**params)["Body"]
+        except Exception as exc:
+            if self._is_missing(exc):
+                raise StorageError(f"object not found: {key}") from exc
+            raise
+        return body.iter_chunks(chunk_size)
+
+    @contextmanager
+    def local_path(self, key: str) -> Iterator[Path]:
+        suffix = Path(key).suffix
+        with tempfile.NamedTemporaryFile(suffix=suffix) as tmp:
+            for chunk in self.iter_bytes(key):
+                tmp.write(chunk)
+            tmp.flush()
+            yield Path(tmp.name)
+
+
+@lru_cache
+def get_storage() -> StorageBackend:
+    if settings.storage_backend == "local":
+        return LocalStorage(settings.storage_dir, shard_depth=settings.storage_shard_depth)
+    if settings.storage_backend == "s3":
+        return S3Storage(settings.s3_bucket)
+    raise StorageError(f"unknown storage backend: {settings.storage_backend}")
+
+
+def import_pdf_key(import_id: int) -> str:
+    return f"uploads/{import_id}.pdf"
+
+
+def import_preview_key(import_id: int) -> str:
+    return f"previews/{import_id}.png"
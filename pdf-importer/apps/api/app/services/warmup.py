@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+API_ROOT = Path(__file__).resolve().parents[2]
+
+
+@dataclass
+class Readiness:
+    schema_error: str | None = "schema not checked yet"
+    warmed_up: bool = False
+    warmup_timings_ms: dict[str, int] = field(default_factory=dict)
+
+
+readiness = Readiness()
+
+
+def check_schema_version(engine: Engine) -> str | None:
+    """Compare the database's Alembic revision with the migration heads; ``None`` means up to date."""
+    from alembic.config import Config
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    config = Config(str(API_ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(API_ROOT / "alembic"))
+    heads = set(ScriptDirectory.from_config(config).get_heads())
+    with engine.connect() as conn:
+        current = set(MigrationContext.configure(conn).get_current_heads())
+    if current != heads:
+        return f"database revision {sorted(current) or 'none'} != {sorted(heads)}, run `alembic upgrade head`"
+    return None
+
+
+def _warm_tesseract() -> None:
+    import pytesseract
+    from PIL import Image
+
+    pytesseract.get_tesseract_version()
+    # every call starts a new tesseract process; this only pulls the binary and
+    # language models into the OS file cache, nothing stays loaded in memory
+    pytesseract.image_to_string(Image.new("L", (64, 32), 255), lang=settings.ocr_lang)
+
+
+def _warm_pdf() -> None:
+    import fitz
+
+    with fitz.open() as doc:
+        doc.new_page().get_pixmap(matrix=fitz.Matrix(0.1, 0.1))
+
+
+def _warm_schemas() -> None:
+    from app.models import ModelDefinition
+    from app.services.pipeline import schema_validator
+
+    db = SessionLocal()
+    try:
+        for (json_schema,) in db.query(ModelDefinition.json_schema):
+            schema_validator(json_schema)
+    finally:
+        db.close()
+
+
+def _warm_llm() -> None:
+    from app.services.llm import get_client
+
+    client = get_client()
+    if settings.openai_api_key:
+        client.models.retrieve(settings.openai_model)
+
+
+WARMUP_STEPS = {
+    "pdf": _warm_pdf,
+    "tesseract": _warm_tesseract,
+    "schemas": _warm_schemas,
+    "llm": _warm_llm,
+}
+
+
+def warm_up() -> None:
+    for name, step in WARMUP_STEPS.items():
+        started = time.perf_counter()
+        try:
+            step()
+        except Exception:
+            logger.exception("warm-up step %s failed", name)
+        readiness.warmup_timings_ms[name] = int((time.perf_counter() - started) * 1000)
+    readiness.warmed_up = True
+    logger.info("warm-up finished %s", readiness.warmup_timings_ms)
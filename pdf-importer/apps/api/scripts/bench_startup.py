@@ -0,0 +1,104 @@
+"""Measure how quickly a fresh API process becomes usable.
+
+Run from ``apps/api``::
+
+    python scripts/bench_startup.py --runs 5
+
+Reports the import time of ``app.main`` and the wall time from spawning
+uvicorn until ``/health`` (and ``/ready``) answer, plus any heavy dependency
+that got imported eagerly.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+API_ROOT = Path(__file__).resolve().parents[1]
+HEAVY_MODULES = ("fitz", "pytesseract", "pdf2image", "openai", "jsonschema", "PIL", "alembic")
+
+IMPORT_PROBE = f"""
+import json, sys, time
+started = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - started
+print(json.dumps({{"seconds": elapsed, "heavy": [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))
+"""
+
+
+def measure_import() -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE], cwd=API_ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for(url: str, started: float, timeout: float) -> float | None:
+    while time.perf_counter() - started < timeout:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return time.perf_counter() - started
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(0.02)
+    return None
+
+
+def measure_boot(timeout: float) -> dict:
+    port = _free_port()
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=API_ROOT,
+    )
+    try:
+        health = _wait_for(f"http://127.0.0.1:{port}/health", started, timeout)
+        ready = _wait_for(f"http://127.0.0.1:{port}/ready", started, timeout)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+    return {"health": health, "ready": ready}
+
+
+def _summary(values: list[float]) -> str:
+    if not values:
+        return "n/a"
+    return f"median {statistics.median(values) * 1000:.0f} ms, max {max(values) * 1000:.0f} ms"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--skip-boot", action="store_true", help="only measure the import time")
+    args = parser.parse_args(argv)
+
+    imports = [measure_import() for _ in range(args.runs)]
+    print(f"import app.main: {_summary([r['seconds'] for r in imports])}")
+    heavy = sorted({m for r in imports for m in r["heavy"]})
+    print(f"heavy modules imported at startup: {', '.join(heavy) or 'none'}")
+
+    if not args.skip_boot:
+        boots = [measure_boot(args.timeout) for _ in range(args.runs)]
+        print(f"spawn -> /health: {_summary([b['health'] for b in boots if b['health'] is not None])}")
+        print(f"spawn -> /ready:  {_summary([b['ready'] for b in boots if b['ready'] is not None])}")
+    return 1 if heavy else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
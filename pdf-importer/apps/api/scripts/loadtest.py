@@ -0,0 +1,383 @@
+"""Concurrent load test for the import API with a stub LLM.
+
+Run from ``apps/api``. Against an API that is already running (point its
+``OPENAI_BASE_URL`` at the stub printed on start-up)::
+
+    python scripts/loadtest.py --base-url http://localhost:8000 --concurrency 16 --duration 60
+
+Or let the harness start its own API on a throw-away database::
+
+    python scripts/loadtest.py --spawn --concurrency 8 --duration 30 --llm-latency 0.8
+
+Each worker picks an operation by weight (``--mix upload=3,preview=5,list=2``);
+uploads alternate between native-text and scanned (image-only) PDFs according
+to ``--scanned-ratio``. Every PDF is one multi-page invoice with "Seite i von
+N" markers unless ``--batch-docs`` packs several invoices into one batch scan
+to exercise the splitter. The report lists throughput, latency percentiles and
+error rates per endpoint; 429 responses are counted as rejections, not errors,
+and uploads answered with status "failed" are reported separately (a split
+batch scan counts as failed when any of its child imports failed).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+
+API_ROOT = Path(__file__).resolve().parents[1]
+
+MODEL_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "invoice_number": {"type": "string"},
+        "invoice_date": {"type": "string"},
+        "gross_total": {"type": "number"},
+    },
+    "required": [],
+    "additionalProperties": True,
+}
+
+
+# --- stub LLM -------------------------------------------------------------
+
+
+def make_stub_handler(latency: float, jitter: float):
+    class StubHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            self.rfile.read(length)
+            time.sleep(max(0.0, random.gauss(latency, jitter)))
+            content = json.dumps({"invoice_number": f"LT-{random.randint(1, 10**6)}", "gross_total": 119.0})
+            body = json.dumps(
+                {
+                    "id": "chatcmpl-stub",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": "stub",
+                    "choices": [
+                        {"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}
+                    ],
+                    "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+                }
+            ).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return StubHandler
+
+
+def start_stub_llm(port: int, latency: float, jitter: float) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_stub_handler(latency, jitter))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# --- synthetic PDFs -------------------------------------------------------
+
+
+def invoice_text(number: int, page_no: int, pages: int) -> str:
+    lines = [
+        "ACME GmbH - Musterstrasse 1 - 12345 Berlin",
+        f"Rechnung Nr. LT-{number}",
+        "Rechnungsdatum: 01.02.2024",
+        "Kunde: Beispiel AG",
+    ]
+    lines += [f"Pos {i} Leistung {random.randint(1, 999)}  {random.randint(10, 999)},00 EUR" for i in range(1, 9)]
+    if page_no == pages:
+        lines += ["Nettobetrag 1.000,00 EUR", "MwSt 19% 190,00 EUR", "Gesamtbetrag 1.190,00 EUR"]
+    lines.append(f"Seite {page_no} von {pages}")
+    return "\n".join(lines)
+
+
+def make_pdf(pages: int, scanned: bool, documents: int = 1) -> bytes:
+    """One PDF holding ``documents`` invoices of ``pages`` pages each; more than one is a batch scan."""
+    import fitz
+
+    doc = fitz.open()
+    for _ in range(documents):
+        number = random.randint(1, 10**6)
+        for page_no in range(1, pages + 1):
+            page = doc.new_page()
+            text = invoice_text(number, page_no, pages)
+            if not scanned:
+                page.insert_textbox(fitz.Rect(72, 72, 520, 770), text)
+                continue
+            # render the text to an image and place only the image, as a scanner would
+            with fitz.open() as src:
+                src_page = src.new_page()
+                src_page.insert_textbox(fitz.Rect(72, 72, 520, 770), text)
+                pix = src_page.get_pixmap(matrix=fitz.Matrix(2, 2), colorspace=fitz.csGRAY)
+            page.insert_image(page.rect, stream=pix.tobytes("png"))
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+# --- driver ---------------------------------------------------------------
+
+
+@dataclass
+class EndpointStats:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    rejected: int = 0
+    failed_imports: int = 0
+    statuses: dict[int, int] = field(default_factory=lambda: defaultdict(int))
+
+    @property
+    def count(self) -> int:
+        return len(self.latencies)
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class LoadTest:
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.stats: dict[str, EndpointStats] = defaultdict(EndpointStats)
+        self.import_ids: list[int] = []
+        self.model_id: int | None = None
+        self.native_pdfs = [make_pdf(args.pages, scanned=False, documents=args.batch_docs) for _ in range(4)]
+        self.scanned_pdfs = (
+            [make_pdf(args.pages, scanned=True, documents=args.batch_docs) for _ in range(4)]
+            if args.scanned_ratio > 0
+            else []
+        )
+        self.mix = self._parse_mix(args.mix)
+
+    @staticmethod
+    def _parse_mix(raw: str) -> list[tuple[str, float]]:
+        mix = []
+        for part in raw.split(","):
+            name, _, weight = part.partition("=")
+            if name not in {"upload", "preview", "list"}:
+                raise SystemExit(f"unknown operation in --mix: {name}")
+            mix.append((name, float(weight or 1)))
+        return mix
+
+    async def _timed(self, name: str, request) -> httpx.Response | None:
+        started = time.perf_counter()
+        try:
+            response = await request
+        except httpx.HTTPError:
+            self.stats[name].latencies.append(time.perf_counter() - started)
+            self.stats[name].errors += 1
+            return None
+        stat = self.stats[name]
+        stat.latencies.append(time.perf_counter() - started)
+        stat.statuses[response.status_code] += 1
+        if response.status_code == 429:
+            stat.rejected += 1
+        elif response.status_code >= 400:
+            stat.errors += 1
+        return response
+
+    async def upload(self, client: httpx.AsyncClient) -> None:
+        scanned = self.scanned_pdfs and random.random() < self.args.scanned_ratio
+        pdf = random.choice(self.scanned_pdfs if scanned else self.native_pdfs)
+        name = "upload_scanned" if scanned else "upload_native"
+        response = await self._timed(
+            name,
+            client.post(
+                "/api/imports",
+                data={"model_id": str(self.model_id)},
+                files={"file": ("loadtest.pdf", pdf, "application/pdf")},
+            ),
+        )
+        if response is not None and response.status_code == 200:
+            body = response.json()
+            self.import_ids.append(body["id"])
+            failed = body["status"] == "failed"
+            if body["status"] == "split":
+                # batch scans answer with the parent; the outcome is on the children
+                children = await client.get("/api/imports", params={"parent_id": body["id"]})
+                failed = any(child["status"] == "failed" for child in children.json())
+            if failed:
+                self.stats[name].failed_imports += 1
+
+    async def preview(self, client: httpx.AsyncClient) -> None:
+        if not self.import_ids:
+            return await self.upload(client)
+        import_id = random.choice(self.import_ids)
+        page = random.randint(1, self.args.pages * self.args.batch_docs)
+        await self._timed("preview", client.get(f"/api/imports/{import_id}/preview", params={"page": page}))
+
+    async def list_imports(self, client: httpx.AsyncClient) -> None:
+        await self._timed("list", client.get("/api/imports"))
+
+    async def worker(self, client: httpx.AsyncClient, deadline: float) -> None:
+        operations = {"upload": self.upload, "preview": self.preview, "list": self.list_imports}
+        names = [name for name, _ in self.mix]
+        weights = [weight for _, weight in self.mix]
+        while time.perf_counter() < deadline:
+            operation = random.choices(names, weights)[0]
+            await operations[operation](client)
+
+    async def run(self) -> float:
+        timeout = httpx.Timeout(self.args.request_timeout)
+        limits = httpx.Limits(max_connections=self.args.concurrency)
+        async with httpx.AsyncClient(base_url=self.args.base_url, timeout=timeout, limits=limits) as client:
+            created = await client.post("/api/models", json={"name": "loadtest", "json_schema": MODEL_SCHEMA})
+            created.raise_for_status()
+            self.model_id = created.json()["id"]
+
+            started = time.perf_counter()
+            deadline = started + self.args.duration
+            await asyncio.gather(*(self.worker(client, deadline) for _ in range(self.args.concurrency)))
+            return time.perf_counter() - started
+
+    def report(self, elapsed: float) -> dict:
+        rows = {}
+        for name, stat in sorted(self.stats.items()):
+            rows[name] = {
+                "requests": stat.count,
+                "throughput_rps": round(stat.count / elapsed, 2),
+                "p50_ms": round(percentile(stat.latencies, 50) * 1000, 1),
+                "p90_ms": round(percentile(stat.latencies, 90) * 1000, 1),
+                "p99_ms": round(percentile(stat.latencies, 99) * 1000, 1),
+                "mean_ms": round(statistics.fmean(stat.latencies) * 1000, 1) if stat.latencies else 0.0,
+                "error_rate": round(stat.errors / stat.count, 4) if stat.count else 0.0,
+                "rejected_rate": round(stat.rejected / stat.count, 4) if stat.count else 0.0,
+                "failed_import_rate": round(stat.failed_imports / stat.count, 4) if stat.count else 0.0,
+                "statuses": dict(stat.statuses),
+            }
+        total = sum(s.count for s in self.stats.values())
+        return {
+            "elapsed_s": round(elapsed, 2),
+            "concurrency": self.args.concurrency,
+            "total_requests": total,
+            "total_rps": round(total / elapsed, 2) if elapsed else 0.0,
+            "endpoints": rows,
+        }
+
+
+def print_report(report: dict) -> None:
+    print(
+        f"\n{report['total_requests']} requests in {report['elapsed_s']} s "
+        f"at concurrency {report['concurrency']} ({report['total_rps']} req/s)\n"
+    )
+    header = f"{'endpoint':<16}{'reqs':>7}{'rps':>8}{'p50':>9}{'p90':>9}{'p99':>9}{'err%':>7}{'429%':>7}{'fail%':>7}"
+    print(header)
+    print("-" * len(header))
+    for name, row in report["endpoints"].items():
+        print(
+            f"{name:<16}{row['requests']:>7}{row['throughput_rps']:>8}{row['p50_ms']:>9}{row['p90_ms']:>9}"
+            f"{row['p99_ms']:>9}{row['error_rate'] * 100:>7.1f}{row['rejected_rate'] * 100:>7.1f}"
+            f"{row['failed_import_rate'] * 100:>7.1f}"
+        )
+
+
+# --- spawned API ----------------------------------------------------------
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def spawn_api(workdir: Path, stub_url: str, workers: int) -> tuple[subprocess.Popen, str]:
+    port = _free_port()
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(API_ROOT),
+        "DATABASE_URL": f"sqlite:///{workdir / 'app.db'}",
+        "STORAGE_DIR": str(workdir),
+        "OPENAI_API_KEY": "stub",
+        "OPENAI_BASE_URL": stub_url,
+    }
+    subprocess.run([sys.executable, "-m", "alembic", "upgrade", "head"], cwd=API_ROOT, env=env, check=True)
+    proc = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--port", str(port), "--workers", str(workers), "--log-level", "warning",
+        ],
+        cwd=API_ROOT,
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return proc, base_url
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    proc.terminate()
+    raise SystemExit("spawned API did not become healthy within 30 s")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--spawn", action="store_true", help="start a local API on a temporary database")
+    parser.add_argument("--api-workers", type=int, default=1, help="uvicorn workers for --spawn")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to generate load")
+    parser.add_argument("--mix", default="upload=3,preview=5,list=2")
+    parser.add_argument("--pages", type=int, default=2, help="pages per synthetic invoice")
+    parser.add_argument(
+        "--batch-docs", type=int, default=1, help="invoices per uploaded PDF; above 1 exercises the batch splitter"
+    )
+    parser.add_argument("--scanned-ratio", type=float, default=0.3, help="share of uploads without a text layer")
+    parser.add_argument("--request-timeout", type=float, default=120.0)
+    parser.add_argument("--llm-port", type=int, default=0, help="stub LLM port (0 = pick a free one)")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="mean stub LLM latency in seconds")
+    parser.add_argument("--llm-jitter", type=float, default=0.1)
+    parser.add_argument("--json", type=Path, help="also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    stub = start_stub_llm(args.llm_port or _free_port(), args.llm_latency, args.llm_jitter)
+    stub_url = f"http://127.0.0.1:{stub.server_address[1]}/v1"
+    print(f"stub LLM listening on {stub_url}")
+
+    proc = None
+    with tempfile.TemporaryDirectory(prefix="loadtest-") as workdir:
+        try:
+            if args.spawn:
+                proc, args.base_url = spawn_api(Path(workdir), stub_url, args.api_workers)
+            load = LoadTest(args)
+            elapsed = asyncio.run(load.run())
+        finally:
+            if proc is not None:
+                proc.terminate()
+                proc.wait(timeout=10)
+            stub.shutdown()
+
+    report = load.report(elapsed)
+    print_report(report)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,24 @@
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+API_ROOT = Path(__file__).resolve().parents[1]
+
+# settings are read on first import of app.*, so point them at a throwaway directory first
+TEST_DATA_DIR = Path(tempfile.mkdtemp(prefix="pdf-importer-tests-"))
+os.environ["DATABASE_URL"] = f"sqlite:///{TEST_DATA_DIR / 'app.db'}"
+os.environ["STORAGE_DIR"] = str(TEST_DATA_DIR)
+
+
+def pytest_sessionstart(session):
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(str(API_ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(API_ROOT / "alembic"))
+    command.upgrade(config, "head")
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(TEST_DATA_DIR, ignore_errors=True)
@@ -1,3 +1,4 @@
+import uuid
 from pathlib import Path
 
 import fitz
@@ -135,3 +136,250 @@ def test_delete_import():
 
     check = client.get(f"/api/imports/{import_id}")
     assert check.status_code == 404
+
+
+def test_get_import_file_range():
+    model_resp = client.post(
+        "/api/models",
+        json={
+            "name": "RangeModel",
+            "json_schema": {
+                "type": "object",
+                "properties": {"invoice_number": {"type": "string"}},
+                "required": [],
+                "additionalProperties": True,
+            },
+        },
+    )
+    model_id = model_resp.json()["id"]
+
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "Invoice 555")
+    content = doc.tobytes()
+    doc.close()
+
+    created = client.post(
+        "/api/imports",
+        data={"model_id": str(model_id)},
+        files={"file": ("range.pdf", content, "application/pdf")},
+    )
+    import_id = created.json()["id"]
+
+    full = client.get(f"/api/imports/{import_id}/file")
+    assert full.status_code == 200
+    assert full.headers["accept-ranges"] == "bytes"
+    assert full.content == content
+
+    partial = client.get(f"/api/imports/{import_id}/file", headers={"Range": "bytes=0-99"})
+    assert partial.status_code == 206
+    assert partial.headers["content-range"] == f"bytes 0-99/{len(content)}"
+    assert partial.content == content[:100]
+
+    suffix = client.get(f"/api/imports/{import_id}/file", headers={"Range": "bytes=-10"})
+    assert suffix.status_code == 206
+    assert suffix.content == content[-10:]
+
+    invalid = client.get(f"/api/imports/{import_id}/file", headers={"Range": f"bytes={len(content)}-"})
+    assert invalid.status_code == 416
+
+    preview = client.get(f"/api/imports/{import_id}/preview")
+    assert preview.status_code == 200
+    assert preview.content.startswith(b"\x89PNG")
+
+    client.delete(f"/api/imports/{import_id}")
+
+
+def test_create_import_splits_batch_scan():
+    model_resp = client.post(
+        "/api/models",
+        json={
+            "name": "SplitModel",
+            "json_schema": {
+                "type": "object",
+                "properties": {"invoice_number": {"type": "string"}},
+                "required": [],
+                "additionalProperties": True,
+            },
+        },
+    )
+    model_id = model_resp.json()["id"]
+
+    doc = fitz.open()
+    for number in ("RE-2001", "RE-2002"):
+        doc.new_page().insert_text((72, 72), f"Rechnung Rechnungsnummer: {number}")
+    content = doc.tobytes()
+    doc.close()
+
+    created = client.post(
+        "/api/imports",
+        data={"model_id": str(model_id)},
+        files={"file": ("batch.pdf", content, "application/pdf")},
+    )
+    assert created.status_code == 200
+    parent = created.json()
+    assert parent["status"] == "split"
+
+    children = client.get("/api/imports", params={"parent_id": parent["id"]}).json()
+    assert sorted((c["page_start"], c["page_end"]) for c in children) == [(1, 1), (2, 2)]
+    assert all(c["status"] in {"done", "failed"} for c in children)
+
+    child_file = client.get(f"/api/imports/{children[0]['id']}/file")
+    assert child_file.content == content
+
+    deleted = client.delete(f"/api/imports/{parent['id']}")
+    assert deleted.status_code == 200
+    assert client.get(f"/api/imports/{children[0]['id']}").status_code == 404
+
+
+def test_reimport_is_flagged_as_duplicate():
+    model_resp = client.post(
+        "/api/models",
+        json={
+            "name": "DuplicateModel",
+            "json_schema": {
+                "type": "object",
+                "properties": {"invoice_number": {"type": "string"}},
+                "required": [],
+                "additionalProperties": True,
+            },
+        },
+    )
+    model_id = model_resp.json()["id"]
+
+    def upload(text, name):
+        doc = fitz.open()
+        doc.new_page().insert_textbox(fitz.Rect(72, 72, 520, 770), text)
+        content = doc.tobytes()
+        doc.close()
+        return client.post(
+            "/api/imports",
+            data={"model_id": str(model_id)},
+            files={"file": (name, content, "application/pdf")},
+        ).json()
+
+    run = uuid.uuid4().hex
+    text = (
+        f"Rechnung Rechnungsnummer: DUP-{run[:8]} Lieferant: Duplikat {run[8:16]} GmbH Kunde: Beispiel AG "
+        f"Beratungsleistung {run[16:24]} Maerz 2024 Nettobetrag 1.000,00 EUR MwSt 190,00 EUR Gesamtbetrag 1.190,00 EUR"
+    )
+    first = upload(text, "original.pdf")
+    second = upload(text.replace("Rechnung ", "RECHNUNG\n"), "rescan.pdf")
+
+    assert first["duplicate_of_id"] is None
+    assert second["duplicate_of_id"] == first["id"]
+    similar = client.get(f"/api/imports/{second['id']}/similar").json()
+    assert similar[0] == {"import_id": first["id"], "distance": 0}
+
+    # reprocessing the original must not flag it as a duplicate of the later rescan
+    reprocessed = client.post(f"/api/imports/{first['id']}/reprocess").json()
+    assert reprocessed["status"] == "done"
+    assert reprocessed["duplicate_of_id"] is None
+    assert client.get(f"/api/imports/{first['id']}/similar").json()[0]["import_id"] == second["id"]
+
+
+def test_reprocess_resumes_after_failed_page(monkeypatch):
+    from app.api import imports
+    from app.core.config import settings
+    from app.services import pipeline
+
+    monkeypatch.setattr(settings, "batch_split_enabled", False)
+    model_id = client.post(
+        "/api/models",
+        json={"name": "ResumeModel", "json_schema": {"type": "object", "properties": {}, "additionalProperties": True}},
+    ).json()["id"]
+
+    doc = fitz.open()
+    for text in (
+        "Rechnung Seite 1 von 2 Nettobetrag",
+        "Rechnung Seite 2 von 2 Gesamtbetrag 119,00 EUR",
+        "Allgemeine Geschaeftsbedingungen Gerichtsstand",
+    ):
+        doc.new_page().insert_text((72, 72), text)
+    content = doc.tobytes()
+    doc.close()
+
+    extracted = []
+    real_extract = pipeline.extract_page_text
+
+    def flaky_extract(doc, file_path, page_number):
+        if page_number == 2 and not extracted.count(2):
+            extracted.append(page_number)
+            raise RuntimeError("ocr crashed")
+        extracted.append(page_number)
+        return real_extract(doc, file_path, page_number)
+
+    monkeypatch.setattr(pipeline, "extract_page_text", flaky_extract)
+    created = client.post(
+        "/api/imports",
+        data={"model_id": str(model_id)},
+        files={"file": ("resume.pdf", content, "application/pdf")},
+    ).json()
+    assert created["status"] == "failed"
+
+    pages = client.get(f"/api/imports/{created['id']}/pages").json()
+    assert [(p["page_number"], p["status"]) for p in pages] == [(1, "done"), (2, "failed"), (3, "skipped")]
+    assert "Seite 1 von 2" in pages[0]["text"]
+    assert pages[0]["engine"] == "native"
+    assert pages[1]["error"] == "ocr crashed"
+
+    reserved = []
+    real_acquire = imports.governor.acquire
+
+    def recording_acquire(pages, dpi):
+        reserved.append(pages)
+        return real_acquire(pages=pages, dpi=dpi)
+
+    monkeypatch.setattr(imports.governor, "acquire", recording_acquire)
+    reprocessed = client.post(f"/api/imports/{created['id']}/reprocess").json()
+    assert reserved == [1]
+    assert reprocessed["status"] == "done"
+    assert extracted == [1, 2, 2]
+    assert "Seite 1 von 2" in reprocessed["ocr_text"] and "Seite 2 von 2" in reprocessed["ocr_text"]
+
+    pages = client.get(f"/api/imports/{created['id']}/pages", params={"include_words": True}).json()
+    assert [p["status"] for p in pages] == ["done", "done", "skipped"]
+    assert pages[1]["words"][0][4] == "Rechnung"
+    assert pages[0]["words"] is not None
+
+
+def test_scanned_terms_are_left_out_after_ocr(monkeypatch):
+    from app.core.config import settings
+    from app.services import pipeline
+    from app.services.ocr import ENGINE_OCR, PageText
+
+    monkeypatch.setattr(settings, "batch_split_enabled", False)
+    model_id = client.post(
+        "/api/models",
+        json={"name": "ScanModel", "json_schema": {"type": "object", "properties": {}, "additionalProperties": True}},
+    ).json()["id"]
+
+    ocr_text = {
+        1: "Allgemeine Geschaeftsbedingungen\n1. Geltungsbereich\n2. Gerichtsstand",
+        2: "Rechnung Nr. RE-77\nGesamtbetrag 119,00 EUR",
+    }
+    doc = fitz.open()
+    for page_number, text in ocr_text.items():
+        # the terms page is a dense full scan, the invoice page only two short lines
+        with fitz.open() as src:
+            src_page = src.new_page()
+            src_page.insert_textbox(fitz.Rect(72, 72, 520, 770), (text + "\n") * (12 if page_number == 1 else 1))
+            pix = src_page.get_pixmap(matrix=fitz.Matrix(2, 2), colorspace=fitz.csGRAY)
+        doc.new_page().insert_image(fitz.Rect(0, 0, 595, 842), stream=pix.tobytes("png"))
+    content = doc.tobytes()
+    doc.close()
+
+    monkeypatch.setattr(
+        pipeline,
+        "extract_page_text",
+        lambda doc, file_path, page_number: PageText(page_number, ocr_text[page_number], ENGINE_OCR, 1),
+    )
+    created = client.post(
+        "/api/imports",
+        data={"model_id": str(model_id)},
+        files={"file": ("scan.pdf", content, "application/pdf")},
+    ).json()
+
+    assert created["status"] == "done"
+    assert created["ocr_text"] == ocr_text[2]
+    pages = client.get(f"/api/imports/{created['id']}/pages").json()
+    assert [(p["label"], p["status"]) for p in pages] == [("irrelevant", "done"), ("invoice", "done")]
@@ -0,0 +1,74 @@
+import random
+
+import pytest
+from pydantic import ValidationError
+
+from app.core.config import Settings, settings
+from app.services.dedup import BANDS, MAX_DISTANCE, band_probes, bands, hamming, probe_radius, simhash
+
+INVOICE = """
+ACME GmbH, Musterstrasse 1, 12345 Berlin
+Rechnung Nr. RE-2024-0042 vom 01.02.2024
+Kunde: Beispiel AG, Hauptstrasse 5, 54321 Hamburg
+Pos 1 Beratung 10 Stunden a 120,00 EUR 1.200,00 EUR
+Pos 2 Reisekosten pauschal 150,00 EUR
+Pos 3 Softwarelizenz Jahresabo 900,00 EUR
+Pos 4 Schulung vor Ort zwei Tage 1.600,00 EUR
+Pos 5 Wartung und Support Quartal 450,00 EUR
+Nettobetrag 4.300,00 EUR MwSt 19% 817,00 EUR Gesamtbetrag 5.117,00 EUR
+Zahlbar bis 15.02.2024 ohne Abzug auf IBAN DE89 3704 0044 0532 0130 00
+Vielen Dank fuer Ihren Auftrag und die angenehme Zusammenarbeit.
+"""
+
+
+def test_rescan_is_near_duplicate():
+    rescan = INVOICE.upper().replace("\n", "  ").replace(",", " , ")
+    assert hamming(simhash(INVOICE), simhash(rescan)) == 0
+
+    for ocr_noise in (
+        INVOICE.replace("Musterstrasse", "Musterstrafse"),
+        INVOICE.replace("RE-2024-0042", "RE-2O24-0042"),
+    ):
+        assert hamming(simhash(INVOICE), simhash(ocr_noise)) <= settings.duplicate_max_distance
+
+
+def test_next_invoice_from_same_sender_is_not_a_duplicate():
+    following = INVOICE.replace("RE-2024-0042", "RE-2024-0057").replace("01.02.2024", "01.03.2024")
+    assert hamming(simhash(INVOICE), simhash(following)) > settings.duplicate_max_distance
+
+
+def test_different_invoice_is_far_away():
+    other = """
+    Stadtwerke Musterstadt, Energieabrechnung 2023 fuer Zaehlernummer 778899
+    Verbrauch 3.450 kWh, Grundpreis 120,00 EUR, Arbeitspreis 980,00 EUR
+    Abschlaege bereits bezahlt 1.000,00 EUR, Nachzahlung 100,00 EUR
+    """
+    assert hamming(simhash(INVOICE), simhash(other)) > 10
+
+
+def test_bands_cover_signature():
+    signature = simhash(INVOICE)
+    parts = bands(signature)
+    assert len(parts) == 4
+    assert sum(part << (16 * i) for i, part in enumerate(parts)) == signature
+
+
+def test_band_probes_find_every_signature_within_max_distance():
+    rng = random.Random(7)
+    signature = simhash(INVOICE)
+    for distance in range(MAX_DISTANCE + 1):
+        radius = probe_radius(distance)
+        probes = [set(band_probes(part, radius)) for part in bands(signature)]
+        for _ in range(50):
+            other = signature
+            for bit in rng.sample(range(64), distance):
+                other ^= 1 << bit
+            assert any(part in probes[i] for i, part in enumerate(bands(other)))
+
+
+def test_max_distance_is_bounded_by_banding():
+    assert probe_radius(MAX_DISTANCE) == MAX_DISTANCE // BANDS
+    with pytest.raises(ValueError):
+        probe_radius(MAX_DISTANCE + 1)
+    with pytest.raises(ValidationError):
+        Settings(duplicate_max_distance=MAX_DISTANCE + 1)
@@ -0,0 +1,126 @@
+import csv
+import io
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.db.session import SessionLocal
+from app.main import app
+from app.models import ImportRecord
+from app.services.export import flatten_rows, schema_columns
+
+client = TestClient(app)
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "document": {"$ref": "#/$defs/document"},
+        "line_items": {"type": "array", "items": {"$ref": "#/$defs/line_item"}},
+        "tags": {"type": "array", "items": {"type": "string"}},
+    },
+    "$defs": {
+        "document": {
+            "type": "object",
+            "properties": {"document_id": {"type": "string"}, "total": {"type": "number"}},
+        },
+        "line_item": {
+            "type": "object",
+            "properties": {"line_no": {"type": "integer"}, "description": {"type": "string"}},
+        },
+    },
+}
+
+
+def test_schema_columns_flatten_and_explode_line_items():
+    columns = schema_columns(SCHEMA)
+    assert [(c.name, c.type, c.in_line_item) for c in columns] == [
+        ("document.document_id", "string", False),
+        ("document.total", "number", False),
+        ("line_items.line_no", "integer", True),
+        ("line_items.description", "string", True),
+        ("tags", "string", False),
+    ]
+
+    extracted = {
+        "document": {"document_id": "RE-1", "total": "12.5"},
+        "line_items": [{"line_no": 1, "description": "A"}, {"line_no": 2, "description": "B"}],
+        "tags": ["x"],
+    }
+    rows = list(flatten_rows({"import_id": 1}, extracted, columns))
+    assert [r["line_items.line_no"] for r in rows] == [1, 2]
+    assert all(r["document.total"] == 12.5 and r["tags"] == '["x"]' for r in rows)
+
+
+def test_schema_columns_with_nullable_types():
+    schema = {
+        "type": "object",
+        "properties": {
+            "total": {"type": ["number", "null"]},
+            "paid": {"type": ["boolean", "null"]},
+            "buyer": {"type": ["object", "null"], "properties": {"name": {"type": ["string", "null"]}}},
+            "reference": {"type": ["string", "integer"]},
+        },
+    }
+    columns = schema_columns(schema)
+    assert [(c.name, c.type) for c in columns] == [
+        ("total", "number"),
+        ("paid", "boolean"),
+        ("buyer.name", "string"),
+        ("reference", "string"),
+    ]
+
+    rows = list(flatten_rows({"import_id": 1}, {"total": "9.5", "buyer": None}, columns))
+    assert rows[0]["total"] == 9.5 and rows[0]["buyer.name"] is None
+
+
+def _seed_model_with_imports():
+    model_id = client.post("/api/models", json={"name": "ExportModel", "json_schema": SCHEMA}).json()["id"]
+    db = SessionLocal()
+    try:
+        db.add_all(
+            [
+                ImportRecord(
+                    model_id=model_id,
+                    filename="a.pdf",
+                    status="done",
+                    extracted_json=json.dumps(
+                        {"document": {"document_id": "RE-1"}, "line_items": [{"line_no": 1}, {"line_no": 2}]}
+                    ),
+                ),
+                ImportRecord(model_id=model_id, filename="b.pdf", status="failed", error="boom"),
+            ]
+        )
+        db.commit()
+    finally:
+        db.close()
+    return model_id
+
+
+def test_export_ndjson_and_csv():
+    model_id = _seed_model_with_imports()
+
+    ndjson = client.get("/api/exports/imports", params={"model_id": model_id, "status": "done"})
+    assert ndjson.status_code == 200
+    lines = [json.loads(line) for line in ndjson.text.splitlines()]
+    assert [line["filename"] for line in lines] == ["a.pdf"]
+    assert lines[0]["data"]["document"]["document_id"] == "RE-1"
+
+    exported = client.get("/api/exports/imports", params={"format": "csv", "model_id": model_id})
+    assert exported.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(exported.text)))
+    assert [(r["filename"], r["line_items.line_no"]) for r in rows] == [("a.pdf", "1"), ("a.pdf", "2"), ("b.pdf", "")]
+
+    missing_model = client.get("/api/exports/imports", params={"format": "csv"})
+    assert missing_model.status_code == 400
+
+
+def test_export_parquet():
+    pq = pytest.importorskip("pyarrow.parquet")
+    model_id = _seed_model_with_imports()
+
+    exported = client.get("/api/exports/imports", params={"format": "parquet", "model_id": model_id})
+    assert exported.status_code == 200
+    table = pq.read_table(io.BytesIO(exported.content))
+    assert table.num_rows == 3
+    assert table.column("line_items.line_no").to_pylist() == [1, 2, None]
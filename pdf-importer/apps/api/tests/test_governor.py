@@ -0,0 +1,132 @@
+import threading
+
+import fitz
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.governor import AdmissionRejected, ResourceGovernor, estimate_bytes, governor
+
+client = TestClient(app)
+
+
+def test_estimate_bytes_scales_with_dpi():
+    assert estimate_bytes(1, 300) == pytest.approx(26_100_000, rel=0.01)
+    assert estimate_bytes(2, 150) == estimate_bytes(1, 300) // 2
+
+
+def test_governor_queues_then_admits():
+    gov = ResourceGovernor(max_pages=10, max_memory_mb=10_000, max_queue=4, queue_timeout=2.0)
+    admitted = threading.Event()
+
+    def second_request():
+        with gov.acquire(pages=5, dpi=300):
+            admitted.set()
+
+    with gov.acquire(pages=8, dpi=300):
+        worker = threading.Thread(target=second_request)
+        worker.start()
+        worker.join(0.1)
+        assert not admitted.is_set()
+        assert gov.load().queued == 1
+        assert gov.load().saturated
+    worker.join(2.0)
+    assert admitted.is_set()
+
+
+def test_governor_rejects_when_queue_is_full():
+    gov = ResourceGovernor(max_pages=10, max_memory_mb=10_000, max_queue=0, queue_timeout=0.1)
+    with gov.acquire(pages=10, dpi=300):
+        with pytest.raises(AdmissionRejected) as exc_info:
+            with gov.acquire(pages=1, dpi=300):
+                pass
+    assert exc_info.value.retry_after >= 1
+
+    with gov.acquire(pages=500, dpi=300):
+        assert gov.load().inflight_pages == 500
+
+
+def test_health_reports_load():
+    body = client.get("/health").json()
+    assert body["status"] == "ok"
+    assert body["load"]["inflight_pages"] == 0
+
+
+def test_upload_rejected_with_retry_after(monkeypatch):
+    model_id = client.post(
+        "/api/models",
+        json={"name": "Busy", "json_schema": {"type": "object", "properties": {}}},
+    ).json()["id"]
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "Rechnung")
+    content = doc.tobytes()
+    doc.close()
+    imports_before = len(client.get("/api/imports").json())
+
+    monkeypatch.setattr(governor, "max_queue", 0)
+    monkeypatch.setattr(governor, "max_pages", 1)
+    with governor.acquire(pages=1, dpi=300):
+        response = client.post(
+            "/api/imports",
+            data={"model_id": str(model_id)},
+            files={"file": ("busy.pdf", content, "application/pdf")},
+        )
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) >= 1
+    assert len(client.get("/api/imports").json()) == imports_before
+
+
+def test_unreadable_upload_fails_without_admission():
+    model_id = client.post(
+        "/api/models",
+        json={"name": "Broken", "json_schema": {"type": "object", "properties": {}}},
+    ).json()["id"]
+    response = client.post(
+        "/api/imports",
+        data={"model_id": str(model_id)},
+        files={"file": ("broken.pdf", b"%PDF-1.4", "application/pdf")},
+    )
+    assert response.status_code == 200
+    assert response.json()["status"] == "failed"
+    assert response.json()["error"].startswith("unreadable pdf")
+
+
+def _upload(model_name, content):
+    model_id = client.post(
+        "/api/models",
+        json={"name": model_name, "json_schema": {"type": "object", "properties": {}}},
+    ).json()["id"]
+    return client.post(
+        "/api/imports",
+        data={"model_id": str(model_id)},
+        files={"file": (f"{model_name}.pdf", content, "application/pdf")},
+    ).json()
+
+
+def test_rejected_reprocess_leaves_import_untouched(monkeypatch):
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "Rechnung Nr. RE-429 Gesamtbetrag 10,00 EUR")
+    created = _upload("BusyReprocess", doc.tobytes())
+    doc.close()
+    pages_before = client.get(f"/api/imports/{created['id']}/pages").json()
+    assert pages_before
+
+    monkeypatch.setattr(governor, "max_queue", 0)
+    monkeypatch.setattr(governor, "max_pages", 1)
+    with governor.acquire(pages=1, dpi=300):
+        response = client.post(f"/api/imports/{created['id']}/reprocess", params={"reset": True})
+    assert response.status_code == 429
+
+    row = client.get(f"/api/imports/{created['id']}").json()
+    assert (row["status"], row["error"]) == (created["status"], created["error"])
+    assert client.get(f"/api/imports/{created['id']}/pages").json() == pages_before
+
+
+def test_reprocess_of_unreadable_file_fails_cleanly():
+    created = _upload("BrokenReprocess", b"%PDF-1.4")
+    assert created["status"] == "failed"
+
+    response = client.post(f"/api/imports/{created['id']}/reprocess")
+    assert response.status_code == 200
+    assert response.json()["status"] == "failed"
+    assert response.json()["error"].startswith("unreadable pdf")
@@ -0,0 +1,81 @@
+import fitz
+
+from app.services.page_classifier import (
+    PAGE_BLANK,
+    PAGE_INVOICE,
+    PAGE_IRRELEVANT,
+    classify_pages,
+    classify_text,
+    select_pages,
+)
+
+
+def _write_pdf(path, pages):
+    doc = fitz.open()
+    for text in pages:
+        page = doc.new_page()
+        if text:
+            page.insert_textbox(fitz.Rect(72, 72, 520, 770), text)
+    doc.save(path)
+    doc.close()
+
+
+def test_classify_pages(tmp_path):
+    pdf_path = tmp_path / "mixed.pdf"
+    _write_pdf(
+        pdf_path,
+        [
+            "Rechnung\nRechnungsnummer: 2024-001\nRechnungsdatum: 01.02.2024\nGesamtbetrag: 119,00 EUR\nMwSt 19%",
+            "",
+            "Allgemeine Geschaeftsbedingungen (AGB)\n1. Geltungsbereich\n2. Eigentumsvorbehalt\n3. Gerichtsstand",
+        ],
+    )
+
+    decisions = classify_pages(pdf_path)
+    assert [d.label for d in decisions] == [PAGE_INVOICE, PAGE_BLANK, PAGE_IRRELEVANT]
+    assert select_pages(decisions) == [1]
+
+
+def test_classify_pages_keeps_document_without_invoice_page(tmp_path):
+    pdf_path = tmp_path / "terms.pdf"
+    _write_pdf(pdf_path, ["Allgemeine Geschaeftsbedingungen\nGerichtsstand ist Berlin."])
+
+    decisions = classify_pages(pdf_path)
+    assert select_pages(decisions) == [1]
+
+
+def test_classify_pages_without_text_layer(tmp_path):
+    pdf_path = tmp_path / "scans.pdf"
+    doc = fitz.open()
+    scan = fitz.Pixmap(fitz.csGRAY, fitz.IRect(0, 0, 60, 85), False)
+    scan.set_rect(scan.irect, (90,))
+    doc.new_page().insert_image(fitz.Rect(0, 0, 595, 842), pixmap=scan)
+    doc.new_page().draw_rect(fitz.Rect(72, 72, 300, 200), color=(0, 0, 0), fill=(0, 0, 0))
+    doc.save(pdf_path)
+    doc.close()
+
+    decisions = classify_pages(pdf_path)
+    assert [d.label for d in decisions] == [PAGE_INVOICE, PAGE_IRRELEVANT]
+
+
+def test_sparse_scan_is_kept_when_no_invoice_page_remains(tmp_path):
+    pdf_path = tmp_path / "sparse.pdf"
+    doc = fitz.open()
+    with fitz.open() as src:
+        src_page = src.new_page()
+        src_page.insert_textbox(fitz.Rect(72, 72, 520, 770), "Rechnung Nr. RE-77\nGesamtbetrag 119,00 EUR")
+        pix = src_page.get_pixmap(matrix=fitz.Matrix(2, 2), colorspace=fitz.csGRAY)
+    doc.new_page().insert_image(fitz.Rect(0, 0, 595, 842), stream=pix.tobytes("png"))
+    doc.new_page().insert_textbox(fitz.Rect(72, 72, 520, 770), "Allgemeine Geschaeftsbedingungen\nGerichtsstand")
+    doc.save(pdf_path)
+    doc.close()
+
+    decisions = classify_pages(pdf_path)
+    assert decisions[0].reason.startswith("no text, ink ratio")
+    assert select_pages(decisions) == [1, 2]
+
+
+def test_classify_text_of_ocr_output():
+    assert classify_text(1, "ALLGEMEINE GESCHAEFTSBEDINGUNGEN\n1. Geltungsbereich").label == PAGE_IRRELEVANT
+    assert classify_text(2, "Rechnung Nr. RE-77 Gesamtbetrag 119,00 EUR").label == PAGE_INVOICE
+    assert classify_text(3, "  \n").label == PAGE_BLANK
@@ -0,0 +1,149 @@
+import fitz
+
+from app.services import splitter
+from app.services.splitter import detect_documents
+
+
+def _write_scan(path, pages):
+    doc = fitz.open()
+    for text in pages:
+        page = doc.new_page()
+        if not text:
+            continue
+        with fitz.open() as src:
+            src_page = src.new_page()
+            src_page.insert_textbox(fitz.Rect(72, 72, 520, 770), text)
+            pix = src_page.get_pixmap(matrix=fitz.Matrix(2, 2), colorspace=fitz.csGRAY)
+        page.insert_image(page.rect, stream=pix.tobytes("png"))
+    doc.save(path)
+    doc.close()
+
+
+def _write_pdf(path, pages):
+    doc = fitz.open()
+    for text in pages:
+        page = doc.new_page()
+        if text:
+            page.insert_textbox(fitz.Rect(72, 72, 520, 770), text)
+    doc.save(path)
+    doc.close()
+
+
+def test_detect_documents_by_invoice_number_and_separator(tmp_path):
+    pdf_path = tmp_path / "batch.pdf"
+    _write_pdf(
+        pdf_path,
+        [
+            "Rechnung\nRechnungsnummer: RE-1001\nSeite 1 von 2",
+            "Rechnungsnummer: RE-1001\nSeite 2 von 2\nGesamtbetrag 100,00 EUR",
+            "Rechnung\nRechnungsnummer: RE-1002\nGesamtbetrag 50,00 EUR",
+            "",
+            "Rechnung\nBelegnummer: 7781\nGesamtbetrag 10,00 EUR",
+        ],
+    )
+
+    assert detect_documents(pdf_path) == [(1, 2), (3, 3), (5, 5)]
+
+
+def test_detect_documents_by_page_marker(tmp_path):
+    pdf_path = tmp_path / "markers.pdf"
+    _write_pdf(
+        pdf_path,
+        [
+            "Rechnung\nPage 1 of 2",
+            "Positionen\nPage 2 of 2",
+            "Rechnung\nPage 1 of 1",
+        ],
+    )
+
+    assert detect_documents(pdf_path) == [(1, 2), (3, 3)]
+
+
+def test_detect_documents_single_invoice(tmp_path):
+    pdf_path = tmp_path / "single.pdf"
+    _write_pdf(pdf_path, ["Rechnung\nRechnungsnummer: RE-1\nSeite 1 von 2", "Seite 2 von 2\nSumme"])
+
+    assert detect_documents(pdf_path) == [(1, 2)]
+
+
+def test_detect_documents_keeps_terms_with_single_page_invoice(tmp_path):
+    pdf_path = tmp_path / "terms.pdf"
+    _write_pdf(
+        pdf_path,
+        [
+            "Rechnung\nRechnungsnummer: RE-2001\nGesamtbetrag 119,00 EUR\nSeite 1 von 1",
+            "Allgemeine Geschaeftsbedingungen (AGB)\n1. Geltungsbereich\n2. Gerichtsstand",
+        ],
+    )
+
+    assert detect_documents(pdf_path) == [(1, 2)]
+
+
+def test_detect_documents_attaches_terms_after_separator(tmp_path):
+    pdf_path = tmp_path / "separator.pdf"
+    _write_pdf(
+        pdf_path,
+        [
+            "Rechnung\nRechnungsnummer: RE-3001\nGesamtbetrag 50,00 EUR",
+            "",
+            "Allgemeine Geschaeftsbedingungen\n1. Geltungsbereich\n2. Eigentumsvorbehalt",
+            "Haftung\nGerichtsstand ist Berlin.",
+        ],
+    )
+
+    assert detect_documents(pdf_path) == [(1, 4)]
+
+
+def test_detect_documents_attaches_delivery_note(tmp_path):
+    pdf_path = tmp_path / "delivery.pdf"
+    _write_pdf(
+        pdf_path,
+        [
+            "Rechnung\nRechnungsnummer: RE-4001\nGesamtbetrag 80,00 EUR\nSeite 1 von 1",
+            "Lieferschein\nLieferschein Nr. LS-77\nSeite 1 von 1",
+            "Rechnung\nRechnungsnummer: RE-4002\nGesamtbetrag 20,00 EUR",
+        ],
+    )
+
+    assert detect_documents(pdf_path) == [(1, 2), (3, 3)]
+
+
+SCANNED_BATCH = [
+    f"Rechnung\nRechnungsnummer: RE-{number}\n"
+    + "".join(f"Pos {pos} Beratung und Umsetzung vor Ort {pos}00,00 EUR\n" for pos in range(1, 7))
+    + f"Seite {page} von 2"
+    + ("\nGesamtbetrag 119,00 EUR" if page == 2 else "")
+    for number in (5001, 5002, 5003)
+    for page in (1, 2)
+]
+
+
+def test_detect_documents_in_scans_from_header_ocr(tmp_path, monkeypatch):
+    pdf_path = tmp_path / "scanned_batch.pdf"
+    _write_scan(pdf_path, SCANNED_BATCH)
+    # tesseract is not needed here: OCR returns what was rendered into each scan
+    monkeypatch.setattr(splitter, "_signal_ocr_text", lambda page: SCANNED_BATCH[page.number])
+
+    assert detect_documents(pdf_path) == [(1, 2), (3, 4), (5, 6)]
+
+
+def test_detect_documents_in_scans_without_ocr(tmp_path, monkeypatch):
+    pdf_path = tmp_path / "scanned_batch.pdf"
+    _write_scan(pdf_path, [*SCANNED_BATCH[:4], "", *SCANNED_BATCH[4:]])
+
+    def no_tesseract(page):
+        raise OSError("tesseract is not installed")
+
+    monkeypatch.setattr(splitter, "_signal_ocr_text", no_tesseract)
+
+    # only the blank separator sheet is left as a boundary
+    assert detect_documents(pdf_path) == [(1, 4), (6, 7)]
+
+
+def test_sparse_scan_is_not_taken_for_a_separator(tmp_path, monkeypatch):
+    pages = [*SCANNED_BATCH[:2], "Rechnung\nRechnungsnummer: RE-6001\nGesamtbetrag 10,00 EUR"]
+    pdf_path = tmp_path / "sparse_batch.pdf"
+    _write_scan(pdf_path, pages)
+    monkeypatch.setattr(splitter, "_signal_ocr_text", lambda page: pages[page.number])
+
+    assert detect_documents(pdf_path) == [(1, 2), (3, 3)]
@@ -0,0 +1,32 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.warmup import readiness
+
+API_ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_app_import_does_not_load_heavy_dependencies():
+    probe = (
+        "import sys, app.main; "
+        "print(','.join(m for m in ('fitz', 'pytesseract', 'pdf2image', 'openai', 'jsonschema') if m in sys.modules))"
+    )
+    out = subprocess.run([sys.executable, "-c", probe], cwd=API_ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == ""
+
+
+def test_ready_checks_schema_revision(monkeypatch):
+    with TestClient(app) as client:
+        assert client.get("/health").status_code == 200
+        response = client.get("/ready")
+        assert response.status_code == 200
+        assert response.json()["checks"]["schema"] == "ok"
+
+        monkeypatch.setattr(readiness, "schema_error", "database revision ['0001_init'] != ['0004']")
+        response = client.get("/ready")
+        assert response.status_code == 503
+        assert response.json()["status"] == "not ready"
@@ -0,0 +1,101 @@
+import io
+
+import pytest
+
+from app.services.storage import LocalStorage, S3Storage, StorageError
+
+
+class _ClientError(Exception):
+    def __init__(self, code):
+        super().__init__(code)
+        self.response = {"Error": {"Code": code}}
+
+
+class _Body:
+    def __init__(self, data):
+        self.data = data
+
+    def iter_chunks(self, chunk_size):
+        for i in range(0, len(self.data), chunk_size):
+            yield self.data[i : i + chunk_size]
+
+
+class FakeS3Client:
+    """In-memory stand-in for the subset of the S3 API used by S3Storage."""
+
+    def __init__(self):
+        self.objects = {}
+
+    def put_object(self, Bucket, Key, Body):
+        self.objects[(Bucket, Key)] = bytes(Body)
+
+    def upload_fileobj(self, fileobj, bucket, key):
+        self.objects[(bucket, key)] = fileobj.read()
+
+    def head_object(self, Bucket, Key):
+        if (Bucket, Key) not in self.objects:
+            raise _ClientError("404")
+        return {"ContentLength": len(self.objects[(Bucket, Key)])}
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop((Bucket, Key), None)
+
+    def get_object(self, Bucket, Key, Range=None):
+        if (Bucket, Key) not in self.objects:
+            raise _ClientError("NoSuchKey")
+        data = self.objects[(Bucket, Key)]
+        if Range:
+            first, last = Range.removeprefix("bytes=").split("-")
+            data = data[int(first) : int(last) + 1 if last else None]
+        return {"Body": _Body(data)}
+
+
+@pytest.fixture(params=["local", "s3"])
+def storage(request, tmp_path):
+    if request.param == "local":
+        return LocalStorage(tmp_path)
+    return S3Storage("test-bucket", client=FakeS3Client())
+
+
+def test_roundtrip_and_ranges(storage):
+    storage.save("uploads/1.pdf", b"0123456789")
+    assert storage.exists("uploads/1.pdf")
+    assert storage.size("uploads/1.pdf") == 10
+    assert b"".join(storage.iter_bytes("uploads/1.pdf", chunk_size=3)) == b"0123456789"
+    assert b"".join(storage.iter_bytes("uploads/1.pdf", start=2, end=5, chunk_size=3)) == b"2345"
+    assert b"".join(storage.iter_bytes("uploads/1.pdf", start=7)) == b"789"
+
+    with storage.local_path("uploads/1.pdf") as path:
+        assert path.read_bytes() == b"0123456789"
+
+    storage.save_fileobj("uploads/2.pdf", io.BytesIO(b"streamed"))
+    assert storage.read_bytes("uploads/2.pdf") == b"streamed"
+
+    storage.delete("uploads/1.pdf")
+    storage.delete("uploads/1.pdf")
+    assert not storage.exists("uploads/1.pdf")
+    with pytest.raises(StorageError):
+        storage.iter_bytes("uploads/1.pdf")
+
+
+def test_local_storage_shards_files(tmp_path):
+    storage = LocalStorage(tmp_path, shard_depth=2)
+    storage.save("uploads/42.pdf", b"x")
+    stored = list((tmp_path / "uploads").rglob("42.pdf"))
+    assert len(stored) == 1
+    assert len(stored[0].relative_to(tmp_path / "uploads").parts) == 3
+
+
+def test_local_storage_reads_unsharded_files(tmp_path):
+    (tmp_path / "uploads").mkdir()
+    (tmp_path / "uploads" / "7.pdf").write_bytes(b"old layout")
+    storage = LocalStorage(tmp_path, shard_depth=2)
+
+    assert storage.exists("uploads/7.pdf")
+    assert storage.size("uploads/7.pdf") == 10
+    assert storage.read_bytes("uploads/7.pdf") == b"old layout"
+    with storage.local_path("uploads/7.pdf") as path:
+        assert path == tmp_path / "uploads" / "7.pdf"
+
+    storage.delete("uploads/7.pdf")
+    assert not storage.exists("uploads/7.pdf")
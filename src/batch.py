@@ -0,0 +1,323 @@
+"""Offline batch import of invoice PDFs into the SQLite store.
+
+Usage::
+
+    python -m src.batch ./archive --db data/invoices.db --workers 8
+
+Every processed file is recorded in ``batch_checkpoints`` in the same
+transaction as its result, so an interrupted run picks up where it stopped.
+Files without a text layer are checkpointed as ``no_text`` when OCR is off and
+picked up again by a later ``--ocr`` run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+import time
+from collections.abc import Iterable, Iterator
+from functools import lru_cache
+from multiprocessing import Pool
+from pathlib import Path
+
+from .db import create_connection, init_db
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_PATH = Path(__file__).resolve().parent.parent / "schemas" / "invoice.schema.json"
+
+_AMOUNT = r"(-?\d{1,3}(?:[.\s]\d{3})*(?:,\d{2})|-?\d+(?:[.,]\d{2})?)"
+_DATE = r"(\d{1,2}\.\d{1,2}\.\d{4}|\d{4}-\d{2}-\d{2})"
+PATTERNS = {
+    "document_id": re.compile(
+        r"(?:rechnungs-?(?:nummer|nr\.?)|belegnummer|dokumentnummer|invoice\s*(?:no\.?|number))\s*[:#]?\s*([\w\-/.]{2,})",
+        re.IGNORECASE,
+    ),
+    "issue_date": re.compile(r"(?:rechnungsdatum|datum|invoice date|date)\s*[:]?\s*" + _DATE, re.IGNORECASE),
+    "due_date": re.compile(r"(?:f(?:ae|ä)lligkeitsdatum|zahlbar bis|due date)\s*[:]?\s*" + _DATE, re.IGNORECASE),
+    "gross_total": re.compile(
+        r"(?:gesamtbetrag|bruttobetrag|rechnungsbetrag|gross total|total)\s*[:]?\s*(?:eur|€)?\s*" + _AMOUNT,
+        re.IGNORECASE,
+    ),
+    "net_subtotal": re.compile(r"(?:nettobetrag|zwischensumme|net total)\s*[:]?\s*(?:eur|€)?\s*" + _AMOUNT, re.IGNORECASE),
+    "tax_total": re.compile(
+        r"(?:ust|mwst|mehrwertsteuer|vat)[^\n\d]*(?:\d{1,2}\s*%)?\s*[:]?\s*(?:eur|€)?\s*" + _AMOUNT, re.IGNORECASE
+    ),
+    "seller": re.compile(r"(?:lieferant|aussteller|rechnungsteller|seller)\s*[:]?\s*(.+)", re.IGNORECASE),
+    "buyer": re.compile(r"(?:kunde|rechnungsempf(?:ae|ä)nger|buyer|bill to)\s*[:]?\s*(.+)", re.IGNORECASE),
+    "currency": re.compile(r"\b(EUR|USD|CHF|GBP)\b|(€|\$)"),
+}
+CURRENCY_SYMBOLS = {"€": "EUR", "$": "USD"}
+
+
+@lru_cache
+def schema_validator():
+    from jsonschema import Draft202012Validator
+
+    return Draft202012Validator(json.loads(SCHEMA_PATH.read_text(encoding="utf-8")))
+
+
+def parse_amount(value: str) -> float:
+    """Convert German and English amount notations (``1.234,56``, ``1234.56``) to float."""
+    value = value.replace(" ", "")
+    if "," in value:
+        value = value.replace(".", "").replace(",", ".")
+    return float(value)
+
+
+def parse_date(value: str) -> str:
+    if "-" in value:
+        return value
+    day, month, year = value.split(".")
+    return f"{int(year):04d}-{int(month):02d}-{int(day):02d}"
+
+
+def extract_text(pdf_path: str | Path, ocr: bool = False) -> str:
+    import fitz
+
+    with fitz.open(pdf_path) as doc:
+        text = "\n".join(page.get_text("text") for page in doc)
+    if text.strip() or not ocr:
+        return text
+
+    import pytesseract
+    from pdf2image import convert_from_path
+
+    images = convert_from_path(str(pdf_path), dpi=300)
+    return "\n".join(pytesseract.image_to_string(img, lang=os.getenv("OCR_LANG", "deu+eng")) for img in images)
+
+
+def extract_invoice(text: str) -> dict:
+    """Map labelled values found in ``text`` onto the invoice schema."""
+
+    def find(name: str) -> str | None:
+        match = PATTERNS[name].search(text)
+        return match.group(1).strip() if match else None
+
+    document: dict = {}
+    if value := find("document_id"):
+        document["document_id"] = value
+    for field in ("issue_date", "due_date"):
+        if value := find(field):
+            document[field] = parse_date(value)
+    currency = PATTERNS["currency"].search(text)
+    if currency:
+        document["currency"] = currency.group(1) or CURRENCY_SYMBOLS[currency.group(2)]
+
+    totals: dict = {}
+    for field in ("gross_total", "net_subtotal", "tax_total"):
+        if value := find(field):
+            try:
+                totals[field] = parse_amount(value)
+            except ValueError:
+                pass
+
+    return {
+        "document_type": "invoice",
+        "document": document,
+        "seller": {"name": find("seller") or ""},
+        "buyer": {"name": find("buyer") or ""},
+        "line_items": [],
+        "totals": totals,
+    }
+
+
+def validation_errors(invoice: dict) -> list[str]:
+    return [
+        f"{'/'.join(str(p) for p in error.absolute_path) or '<root>'}: {error.message}"
+        for error in schema_validator().iter_errors(invoice)
+    ]
+
+
+def process_file(task: tuple[str, bool]) -> dict:
+    """Worker entry point; returns a plain dict so results pickle cheaply."""
+    path, ocr = task
+    started = time.perf_counter()
+    try:
+        text = extract_text(path, ocr=ocr)
+        if not ocr and not text.strip():
+            return {"path": path, "status": "no_text", "duration_ms": _ms(started)}
+        invoice = extract_invoice(text)
+        errors = validation_errors(invoice)
+    except Exception as exc:
+        return {"path": path, "status": "failed", "error": f"{type(exc).__name__}: {exc}", "duration_ms": _ms(started)}
+    return {
+        "path": path,
+        "status": "done",
+        "text": text,
+        "invoice": invoice,
+        "errors": errors,
+        "duration_ms": _ms(started),
+    }
+
+
+def _ms(started: float) -> int:
+    return int((time.perf_counter() - started) * 1000)
+
+
+def iter_pdfs(root: str | Path) -> Iterator[Path]:
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if name.lower().endswith(".pdf"):
+                yield Path(dirpath) / name
+
+
+def load_checkpoints(conn) -> dict[str, tuple[int, float, str]]:
+    query = "SELECT source_path, file_size, file_mtime, status FROM batch_checkpoints"
+    return {path: (size, mtime, status) for path, size, mtime, status in conn.execute(query)}
+
+
+def skip_reason(checkpoint: tuple[int, float, str] | None, stat, ocr: bool, retry_failed: bool) -> str | None:
+    """Stats key for a file an earlier run already handled, ``None`` if it has to be processed."""
+    if checkpoint is None or checkpoint[:2] != (stat.st_size, stat.st_mtime):
+        return None
+    status = checkpoint[2]
+    if status == "done":
+        return "skipped"
+    if status == "failed" and not retry_failed:
+        return "previously_failed"
+    if status == "no_text" and not ocr:
+        return "no_text"
+    return None
+
+
+def write_batch(conn, results: list[dict], file_stats: dict[str, tuple[int, float]]) -> None:
+    invoices = []
+    checkpoints = []
+    for result in results:
+        size, mtime = file_stats.pop(result["path"])
+        checkpoints.append(
+            (result["path"], size, mtime, result["status"], result.get("error"), result["duration_ms"])
+        )
+        if result["status"] != "done":
+            continue
+        invoice = result["invoice"]
+        invoices.append(
+            (
+                result["path"],
+                invoice["document"].get("document_id"),
+                invoice["document"].get("issue_date"),
+                invoice["document"].get("currency"),
+                invoice["seller"]["name"] or None,
+                invoice["buyer"]["name"] or None,
+                invoice["totals"].get("gross_total"),
+                int(not result["errors"]),
+                json.dumps(result["errors"], ensure_ascii=False) if result["errors"] else None,
+                json.dumps(invoice, ensure_ascii=False),
+                result["text"],
+            )
+        )
+
+    with conn:
+        conn.executemany(
+            """
+            INSERT INTO invoices (
+                source_path, document_id, issue_date, currency, seller_name, buyer_name,
+                gross_total, is_valid, validation_errors, extracted_json, raw_text
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (source_path) DO UPDATE SET
+                document_id = excluded.document_id,
+                issue_date = excluded.issue_date,
+                currency = excluded.currency,
+                seller_name = excluded.seller_name,
+                buyer_name = excluded.buyer_name,
+                gross_total = excluded.gross_total,
+                is_valid = excluded.is_valid,
+                validation_errors = excluded.validation_errors,
+                extracted_json = excluded.extracted_json,
+                raw_text = excluded.raw_text
+            """,
+            invoices,
+        )
+        conn.executemany(
+            """
+            INSERT INTO batch_checkpoints (source_path, file_size, file_mtime, status, error, duration_ms)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (source_path) DO UPDATE SET
+                file_size = excluded.file_size,
+                file_mtime = excluded.file_mtime,
+                status = excluded.status,
+                error = excluded.error,
+                duration_ms = excluded.duration_ms,
+                processed_at = datetime('now')
+            """,
+            checkpoints,
+        )
+
+
+def run(
+    input_dir: str | Path,
+    db_path: str | Path,
+    workers: int | None = None,
+    batch_size: int = 200,
+    ocr: bool = False,
+    retry_failed: bool = False,
+) -> dict[str, int]:
+    init_db(db_path)
+    conn = create_connection(db_path)
+    conn.execute("PRAGMA journal_mode = WAL;")
+    conn.execute("PRAGMA synchronous = NORMAL;")
+    stats = {"done": 0, "failed": 0, "no_text": 0, "skipped": 0, "previously_failed": 0}
+    try:
+        checkpoints = load_checkpoints(conn)
+        file_stats: dict[str, tuple[int, float]] = {}
+
+        def tasks() -> Iterable[tuple[str, bool]]:
+            for path in iter_pdfs(input_dir):
+                stat = path.stat()
+                key = str(path.resolve())
+                if reason := skip_reason(checkpoints.get(key), stat, ocr, retry_failed):
+                    stats[reason] += 1
+                    continue
+                file_stats[key] = (stat.st_size, stat.st_mtime)
+                yield key, ocr
+
+        batch: list[dict] = []
+        with Pool(processes=workers) as pool:
+            for result in pool.imap_unordered(process_file, tasks(), chunksize=8):
+                stats[result["status"]] += 1
+                batch.append(result)
+                if len(batch) >= batch_size:
+                    write_batch(conn, batch, file_stats)
+                    logger.info("committed %s files (%s failed)", stats["done"] + stats["failed"], stats["failed"])
+                    batch.clear()
+        if batch:
+            write_batch(conn, batch, file_stats)
+    finally:
+        conn.close()
+    return stats
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Extract invoices from a directory of PDFs into SQLite.")
+    parser.add_argument("input_dir", type=Path)
+    parser.add_argument("--db", type=Path, default=Path("data/invoices.db"))
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--batch-size", type=int, default=200, help="files per database transaction")
+    parser.add_argument("--ocr", action="store_true", help="OCR pages without a text layer (needs Tesseract)")
+    parser.add_argument("--retry-failed", action="store_true", help="reprocess files that failed in earlier runs")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"), format="%(asctime)s %(levelname)s %(message)s")
+    if not args.input_dir.is_dir():
+        parser.error(f"not a directory: {args.input_dir}")
+
+    stats = run(args.input_dir, args.db, args.workers, args.batch_size, args.ocr, args.retry_failed)
+    logger.info(
+        "finished: %s processed, %s failed, %s without text layer, %s already done, %s failed in earlier runs",
+        stats["done"],
+        stats["failed"],
+        stats["no_text"],
+        stats["skipped"],
+        stats["previously_failed"],
+    )
+    return 0 if stats["failed"] == 0 and stats["previously_failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+import os
+import sqlite3
+
+import fitz
+
+from src import batch
+from src.db import create_connection, init_db
+
+
+def _write_pdf(path, text):
+    doc = fitz.open()
+    page = doc.new_page()
+    if text:
+        page.insert_textbox(fitz.Rect(72, 72, 520, 770), text)
+    doc.save(path)
+    doc.close()
+
+
+INVOICE_TEXT = (
+    "Rechnung\nRechnungsnummer: RE-2024-17\nRechnungsdatum: 05.03.2024\nLieferant: Muster GmbH\n"
+    "Kunde: Beispiel AG\nNettobetrag 1.000,00 EUR\nGesamtbetrag 1.190,00 EUR"
+)
+
+
+def _checkpoints(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return dict(conn.execute("SELECT source_path, status FROM batch_checkpoints"))
+
+
+def test_extract_invoice():
+    invoice = batch.extract_invoice(INVOICE_TEXT)
+
+    assert invoice["document"] == {"document_id": "RE-2024-17", "issue_date": "2024-03-05", "currency": "EUR"}
+    assert invoice["seller"]["name"] == "Muster GmbH"
+    assert invoice["buyer"]["name"] == "Beispiel AG"
+    assert invoice["totals"]["gross_total"] == 1190.0
+    assert invoice["totals"]["net_subtotal"] == 1000.0
+    assert batch.validation_errors(invoice) == []
+
+
+def test_write_batch(tmp_path):
+    db_path = tmp_path / "invoices.db"
+    init_db(db_path)
+    conn = create_connection(db_path)
+    invoice = batch.extract_invoice(INVOICE_TEXT)
+    results = [
+        {"path": "/a.pdf", "status": "done", "text": INVOICE_TEXT, "invoice": invoice, "errors": [], "duration_ms": 5},
+        {"path": "/b.pdf", "status": "failed", "error": "ValueError: broken", "duration_ms": 1},
+    ]
+    batch.write_batch(conn, results, {"/a.pdf": (10, 1.0), "/b.pdf": (20, 2.0)})
+
+    rows = conn.execute("SELECT source_path, document_id, gross_total, is_valid FROM invoices").fetchall()
+    assert rows == [("/a.pdf", "RE-2024-17", 1190.0, 1)]
+    assert dict(conn.execute("SELECT source_path, error FROM batch_checkpoints")) == {
+        "/a.pdf": None,
+        "/b.pdf": "ValueError: broken",
+    }
+    conn.close()
+
+
+def test_run_skips_checkpointed_files(tmp_path):
+    archive = tmp_path / "archive"
+    archive.mkdir()
+    _write_pdf(archive / "one.pdf", INVOICE_TEXT)
+    _write_pdf(archive / "two.pdf", INVOICE_TEXT.replace("RE-2024-17", "RE-2024-18"))
+    db_path = tmp_path / "invoices.db"
+
+    assert batch.run(archive, db_path, workers=1)["done"] == 2
+    stats = batch.run(archive, db_path, workers=1)
+    assert (stats["done"], stats["skipped"]) == (0, 2)
+
+    # a replaced file is processed again
+    _write_pdf(archive / "two.pdf", INVOICE_TEXT.replace("RE-2024-17", "RE-2024-19"))
+    stat = (archive / "two.pdf").stat()
+    os.utime(archive / "two.pdf", (stat.st_atime, stat.st_mtime + 10))
+    stats = batch.run(archive, db_path, workers=1)
+    assert (stats["done"], stats["skipped"]) == (1, 1)
+    with sqlite3.connect(db_path) as conn:
+        ids = {row[0] for row in conn.execute("SELECT document_id FROM invoices")}
+    assert ids == {"RE-2024-17", "RE-2024-19"}
+
+
+def test_run_reports_earlier_failures(tmp_path):
+    archive = tmp_path / "archive"
+    archive.mkdir()
+    (archive / "broken.pdf").write_bytes(b"not a pdf")
+    db_path = tmp_path / "invoices.db"
+
+    assert batch.run(archive, db_path, workers=1)["failed"] == 1
+    stats = batch.run(archive, db_path, workers=1)
+    assert (stats["failed"], stats["skipped"], stats["previously_failed"]) == (0, 0, 1)
+    assert batch.main([str(archive), "--db", str(db_path), "--workers", "1"]) == 1
+
+    stats = batch.run(archive, db_path, workers=1, retry_failed=True)
+    assert (stats["failed"], stats["previously_failed"]) == (1, 0)
+
+
+def test_files_without_text_layer_wait_for_ocr(tmp_path):
+    archive = tmp_path / "archive"
+    archive.mkdir()
+    _write_pdf(archive / "scan.pdf", "")
+    db_path = tmp_path / "invoices.db"
+
+    assert batch.run(archive, db_path, workers=1)["no_text"] == 1
+    assert set(_checkpoints(db_path).values()) == {"no_text"}
+    assert batch.run(archive, db_path, workers=1)["no_text"] == 1
+
+    conn = create_connection(db_path)
+    checkpoint = batch.load_checkpoints(conn)[str((archive / "scan.pdf").resolve())]
+    conn.close()
+    stat = (archive / "scan.pdf").stat()
+    assert batch.skip_reason(checkpoint, stat, ocr=False, retry_failed=False) == "no_text"
+    assert batch.skip_reason(checkpoint, stat, ocr=True, retry_failed=False) is None